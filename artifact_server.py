@@ -0,0 +1,92 @@
+# artifact_server.py - HTTP kecil untuk artifact in-memory (QR, dll) supaya UI bisa load via URL tanpa file di disk
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+ARTIFACT_HOST = os.getenv("ARTIFACT_HOST", "localhost")
+ARTIFACT_PORT = int(os.getenv("ARTIFACT_PORT", "8766"))
+# Bytes kept in memory; least recently used artifacts are evicted first
+ARTIFACT_MAX_BYTES = int(os.getenv("ARTIFACT_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class ArtifactStore:
+    """Bounded in-memory blobs served at http://ARTIFACT_HOST:ARTIFACT_PORT/artifacts/<name>"""
+
+    def __init__(self, host: str = ARTIFACT_HOST, port: int = ARTIFACT_PORT, max_bytes: int = ARTIFACT_MAX_BYTES):
+        self.host = host
+        self.port = port
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def put(self, name: str, content: bytes, mime: str) -> str:
+        """Store `content` and return its URL (starts the server on first use)"""
+        with self._lock:
+            old = self._items.pop(name, None)
+            if old is not None:
+                self._size -= len(old[0])
+            self._items[name] = (content, mime)
+            self._size += len(content)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self._size -= len(evicted)
+        self.start()
+        return f"http://{self.host}:{self.port}/artifacts/{name}"
+
+    def get(self, name: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            item = self._items.get(name)
+            if item is not None:
+                self._items.move_to_end(name)
+            return item
+
+    def start(self):
+        with self._lock:
+            if self._server is not None:
+                return
+            self._server = ThreadingHTTPServer((self.host, self.port), _handler(self))
+            self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="jarvis-artifacts", daemon=True).start()
+
+    def stop(self):
+        with self._lock:
+            server, self._server = self._server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"artifacts": len(self._items), "bytes": self._size}
+
+
+def _handler(store: ArtifactStore):
+    class ArtifactHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            prefix = "/artifacts/"
+            item = store.get(self.path[len(prefix):].split("?")[0]) if self.path.startswith(prefix) else None
+            if item is None:
+                self.send_error(404)
+                return
+            content, mime = item
+            self.send_response(200)
+            self.send_header("Content-Type", mime)
+            self.send_header("Content-Length", str(len(content)))
+            # Names are content keys, so the bytes never change
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, format, *args):
+            # Suppress logs
+            pass
+
+    return ArtifactHandler
+
+
+artifacts = ArtifactStore()
@@ -0,0 +1,56 @@
+# bench_cold_start.py - Import time dan RSS untuk enhanced_tools (lazy vs semua dependency di-load)
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = r'''
+import sys, time
+sys.path.insert(0, {root!r})
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 ** 2)
+    except ImportError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+base = rss_mb()
+start = time.perf_counter()
+import enhanced_tools
+if {eager}:
+    enhanced_tools.prewarm_services(wait=True)
+elapsed = time.perf_counter() - start
+print(f"{{elapsed * 1000:.1f}} {{rss_mb() - base:.1f}}")
+'''
+
+
+def measure(eager: bool, runs: int = 3):
+    results = []
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE.format(root=ROOT, eager=eager)],
+            capture_output=True, text=True, cwd=ROOT
+        )
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1]
+        # Last line only: prewarm warnings for missing optional deps also go to stdout
+        ms, mb = proc.stdout.strip().splitlines()[-1].split()
+        results.append((float(ms), float(mb)))
+    return min(results), None
+
+
+def main():
+    for label, eager in (("lazy (default)", False), ("all deps loaded", True)):
+        result, error = measure(eager)
+        if error:
+            print(f"{label:<16} failed: {error}")
+        else:
+            ms, mb = result
+            print(f"{label:<16} import {ms:8.1f} ms   RSS +{mb:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# bench_image_analysis.py - Latency analyze_image: versi lama (full decode + cascade per call) vs image_analysis
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+import image_analysis
+
+SIZES = [(640, 480), (1280, 720), (1920, 1080), (4000, 3000)]
+
+
+def make_image(directory, width, height):
+    """Synthetic photo-like JPEG: gradient + noise + a few blobs"""
+    rng = np.random.default_rng(width)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :, None]
+    image = np.clip(gradient + rng.normal(0, 25, (height, width, 3)), 0, 255).astype(np.uint8)
+    for _ in range(8):
+        center = (int(rng.integers(0, width)), int(rng.integers(0, height)))
+        cv2.circle(image, center, int(min(width, height) * 0.08), tuple(int(c) for c in rng.integers(0, 255, 3)), -1)
+    path = os.path.join(directory, f"bench_{width}x{height}.jpg")
+    cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    return path
+
+
+def analyze_legacy(path):
+    """The previous enhanced_tools.analyze_image body"""
+    img = cv2.imread(path)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    faces = face_cascade.detectMultiScale(gray, 1.1, 4)
+    return len(faces), np.mean(gray)
+
+
+def timed(fn, path, runs):
+    fn(path)  # warm up (page cache, classifier)
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(path)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    cv2.setNumThreads(1)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'size':>11}  {'legacy ms':>10}  {'fast ms':>8}  {'speedup':>7}  brightness legacy/fast")
+        for width, height in SIZES:
+            path = make_image(directory, width, height)
+            # Full-resolution detection on 12 MP takes tens of seconds; one run is enough
+            legacy = timed(analyze_legacy, path, 1 if width * height > 2_000_000 else 3)
+            fast = timed(image_analysis.analyze, path, 10)
+            result = image_analysis.analyze(path)
+            print(f"{width:>5}x{height:<5}  {legacy:10.1f}  {fast:8.1f}  {legacy / fast:6.1f}x  "
+                  f"{np.mean(cv2.imread(path, cv2.IMREAD_GRAYSCALE)):.1f}/{result.brightness:.1f}")
+
+
+if __name__ == "__main__":
+    main()
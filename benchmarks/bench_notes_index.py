@@ -0,0 +1,82 @@
+# bench_notes_index.py - Latency search notes: linear scan semua file vs inverted index BM25 (notes_index)
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notes_index import NotesIndex, tokenize
+
+DOCUMENTS = int(os.getenv("BENCH_NOTES", "20000"))
+QUERIES = ["meeting budget", "python script error", "weather jakarta", "reminder dentist", "project deadline"]
+
+
+def make_corpus(directory, count):
+    """Synthetic notes: Zipf-ish vocabulary plus a few topical words"""
+    rng = random.Random(42)
+    vocabulary = [f"word{i}" for i in range(20000)]
+    topical = " ".join(QUERIES).split()
+    os.makedirs(directory, exist_ok=True)
+    for i in range(count):
+        words = [vocabulary[min(int(rng.paretovariate(1.1)) - 1, len(vocabulary) - 1)] for _ in range(rng.randint(50, 400))]
+        words += rng.sample(topical, 2)
+        rng.shuffle(words)
+        with open(os.path.join(directory, f"note_{i:05d}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Note {i}\n\n" + " ".join(words))
+
+
+def linear_scan(directory, query):
+    """What searching looked like before: read and tokenize every file per query"""
+    terms = set(tokenize(query))
+    hits = []
+    for name in os.listdir(directory):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            score = sum(1 for t in tokenize(f.read()) if t in terms)
+        if score:
+            hits.append((score, name))
+    return sorted(hits, reverse=True)[:5]
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        notes = os.path.join(tmp, "notes")
+        db = os.path.join(tmp, "notes_index.db")
+        make_corpus(notes, DOCUMENTS)
+
+        start = time.perf_counter()
+        index = NotesIndex(db, roots=[notes])
+        index.refresh(force=True)
+        print(f"Build ({DOCUMENTS} notes): {time.perf_counter() - start:.2f}s, "
+              f"index {os.path.getsize(db) / 1e6:.1f} MB, {index.stats()}")
+
+        start = time.perf_counter()
+        reloaded = NotesIndex(db, roots=[notes])
+        reloaded.stats()
+        print(f"Reload from disk: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        counts = reloaded.refresh(force=True)
+        print(f"Incremental refresh (nothing changed): {(time.perf_counter() - start) * 1000:.0f} ms {counts}")
+
+        timings = []
+        for _ in range(20):
+            for query in QUERIES:
+                start = time.perf_counter()
+                reloaded.search(query)
+                timings.append((time.perf_counter() - start) * 1000)
+        print(f"Indexed search: p50 {percentile(timings, 0.5):.2f} ms, p99 {percentile(timings, 0.99):.2f} ms")
+
+        start = time.perf_counter()
+        linear_scan(notes, QUERIES[0])
+        print(f"Linear scan (1 query): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench_screen_capture.py - CPU per frame: full PNG default tiap frame vs diff per tile + PNG level cepat (frame sintetis)
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+
+import screen_capture
+from screen_capture import CaptureSession, SyntheticSource
+
+FRAMES = 60
+WIDTH, HEIGHT = 1920, 1080
+
+
+def bench_full_png():
+    """Previous behaviour: every frame saved as a full PNG at the default level"""
+    source = SyntheticSource(WIDTH, HEIGHT)
+    size = 0
+    start = time.process_time()
+    for _ in range(FRAMES):
+        ok, buffer = cv2.imencode(".png", source.grab()[:, :, ::-1])
+        size += len(buffer)
+    return (time.process_time() - start) / FRAMES * 1000, size
+
+
+def bench_session(still_every: int):
+    """Tile diff session; every `still_every`-th frame repeats the previous one"""
+    source = SyntheticSource(WIDTH, HEIGHT)
+    session = CaptureSession(source=source, publish=False)
+    start = time.process_time()
+    for i in range(FRAMES):
+        if still_every and i % still_every:
+            source._frame -= 1  # same frame again
+        session.step()
+    cpu = (time.process_time() - start) / FRAMES * 1000
+    return cpu, session.counters
+
+
+def main():
+    cv2.setNumThreads(1)
+    print(f"{FRAMES} frames of {WIDTH}x{HEIGHT}, tile {screen_capture.TILE_SIZE}px, PNG level {screen_capture.PNG_COMPRESSION}")
+    cpu, size = bench_full_png()
+    print(f"full PNG per frame:        {cpu:7.1f} ms CPU/frame  {size / FRAMES / 1024:8.1f} KB/frame")
+    for label, still_every in (("moving box every frame:", 0), ("moving box, 3/4 frames still:", 4)):
+        cpu, counters = bench_session(still_every)
+        print(f"{label:<27}{cpu:7.1f} ms CPU/frame  {counters['bytes'] / FRAMES / 1024:8.1f} KB/frame  "
+              f"({counters['skipped']} skipped, {counters['keyframes']} keyframes, {counters['tiles']} tiles)")
+
+
+if __name__ == "__main__":
+    main()
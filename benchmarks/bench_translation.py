@@ -0,0 +1,69 @@
+# bench_translation.py - Latency cache hit dan throughput batch translation_service (backend simulasi)
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translation_service import Translation, TranslationService
+
+NETWORK_LATENCY = 0.05  # seconds per request, roughly one Google round trip
+TEXTS = [f"sentence number {i} for the benchmark" for i in range(200)]
+
+
+class FakeBackend:
+    """Simulated remote translator: fixed latency per request"""
+
+    def __init__(self):
+        self.requests = 0
+
+    def translate(self, text, source, target):
+        self.requests += 1
+        time.sleep(NETWORK_LATENCY)
+        return Translation(text.upper(), source)
+
+    def translate_batch(self, texts, source, target):
+        self.requests += 1
+        time.sleep(NETWORK_LATENCY)
+        return [Translation(t.upper(), source) for t in texts]
+
+
+def bench_single_calls():
+    backend = FakeBackend()
+    service = TranslationService(backend)
+    start = time.perf_counter()
+    for text in TEXTS:
+        service.translate(text, "id")
+    elapsed = time.perf_counter() - start
+    return len(TEXTS) / elapsed, backend.requests
+
+
+def bench_batch():
+    backend = FakeBackend()
+    service = TranslationService(backend)
+    start = time.perf_counter()
+    service.translate_many(TEXTS, "id")
+    elapsed = time.perf_counter() - start
+    return len(TEXTS) / elapsed, backend.requests
+
+
+def bench_cache_hit(iterations=100_000):
+    service = TranslationService(FakeBackend())
+    service.translate("Hello world", "ja")
+    start = time.perf_counter()
+    for _ in range(iterations):
+        service.translate("Hello world", "ja")
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    print(f"Simulated network latency: {NETWORK_LATENCY * 1000:.0f} ms/request, {len(TEXTS)} texts")
+    rate, requests = bench_single_calls()
+    print(f"one call per text:   {rate:10.1f} texts/s  ({requests} requests)")
+    rate, requests = bench_batch()
+    print(f"translate_many:      {rate:10.1f} texts/s  ({requests} requests)")
+    print(f"cache hit latency:   {bench_cache_hit():10.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
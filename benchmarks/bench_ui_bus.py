@@ -0,0 +1,111 @@
+# bench_ui_bus.py - Events/sec: ui_bus.publish vs old per-event WebSocket dial
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui_bus import UIEventBus
+
+EVENTS = 100_000
+LEGACY_EVENTS = 300
+
+
+def start_loop():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    return loop
+
+
+def bench_bus_no_ui():
+    bus = UIEventBus()
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        bus.publish('tool_status', {'tool': 'search', 'status': 'searching', 'i': i})
+    elapsed = time.perf_counter() - start
+    return EVENTS / elapsed, elapsed / EVENTS * 1e6
+
+
+def bench_bus_attached():
+    loop = start_loop()
+    bus = UIEventBus(max_pending=EVENTS)
+    received = [0]
+    done = threading.Event()
+
+    async def sink(events):
+        received[0] += len(events)
+        if received[0] >= EVENTS:
+            done.set()
+
+    bus.attach(loop, sink)
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        bus.publish('tool_status', {'tool': 'search', 'status': 'searching', 'i': i})
+    publish_time = time.perf_counter() - start
+    done.wait(30)
+    total = time.perf_counter() - start
+    loop.call_soon_threadsafe(loop.stop)
+    return EVENTS / total, publish_time / EVENTS * 1e6, bus.batches
+
+
+def bench_legacy():
+    try:
+        import websockets
+    except ImportError:
+        return None
+
+    loop = start_loop()
+    received = [0]
+
+    async def handler(websocket, *args):
+        async for _ in websocket:
+            received[0] += 1
+
+    async def serve():
+        return await websockets.serve(handler, "localhost", 0)
+
+    server = asyncio.run_coroutine_threadsafe(serve(), loop).result()
+    port = next(iter(server.sockets)).getsockname()[1]
+
+    # Same code path as the old tools_ui.broadcast_to_ui
+    async def broadcast_to_ui(message_type, data):
+        try:
+            async with websockets.connect(f"ws://localhost:{port}") as websocket:
+                await websocket.send(json.dumps({
+                    'type': message_type,
+                    'data': data,
+                    'timestamp': datetime.now().isoformat()
+                }))
+        except Exception:
+            pass
+
+    start = time.perf_counter()
+    for i in range(LEGACY_EVENTS):
+        asyncio.run(broadcast_to_ui('tool_status', {'tool': 'search', 'status': 'searching', 'i': i}))
+    elapsed = time.perf_counter() - start
+    loop.call_soon_threadsafe(server.close)
+    return LEGACY_EVENTS / elapsed, elapsed / LEGACY_EVENTS * 1e6
+
+
+def main():
+    rate, per_call = bench_bus_no_ui()
+    print(f"ui_bus (no UI attached): {rate:>12,.0f} events/s  {per_call:6.2f} µs/publish")
+
+    rate, per_call, batches = bench_bus_attached()
+    print(f"ui_bus (UI attached):    {rate:>12,.0f} events/s  {per_call:6.2f} µs/publish  ({batches} batches)")
+
+    legacy = bench_legacy()
+    if legacy is None:
+        print("legacy broadcast_to_ui: skipped (websockets not installed)")
+    else:
+        rate, per_call = legacy
+        print(f"legacy broadcast_to_ui:  {rate:>12,.0f} events/s  {per_call:6.0f} µs/publish")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench_voice_latency.py - Callback-to-websocket.send latency (p50/p99): UI bus vs 100 ms polling
+import asyncio
+import os
+import queue
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui_bus import UIEventBus
+
+MESSAGES = 300
+
+
+class FakeWebSocket:
+    """Records when each message reaches send()"""
+
+    def __init__(self):
+        self.latencies = []
+        self.done = threading.Event()
+
+    async def send(self, message):
+        self.latencies.append(time.perf_counter() - message['sent_at'])
+        if len(self.latencies) >= MESSAGES:
+            self.done.set()
+
+
+def fire_callbacks(callback):
+    """Simulate ElevenLabs callbacks arriving on a worker thread"""
+    for i in range(MESSAGES):
+        callback({'type': 'transcript', 'text': f'message {i}', 'sent_at': time.perf_counter()})
+        time.sleep(random.uniform(0.0005, 0.003))
+
+
+def run_loop(main):
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete, args=(main(loop),), daemon=True)
+    thread.start()
+    return loop
+
+
+def bench_polling():
+    message_queue = queue.Queue()
+    client = FakeWebSocket()
+
+    async def main(loop):
+        # Same loop as the old process_message_queue
+        while not client.done.is_set():
+            while not message_queue.empty():
+                await client.send(message_queue.get_nowait())
+            await asyncio.sleep(0.1)
+
+    run_loop(main)
+    fire_callbacks(message_queue.put)
+    client.done.wait(30)
+    return client.latencies
+
+
+def bench_bus():
+    bus = UIEventBus()
+    client = FakeWebSocket()
+    attached = threading.Event()
+
+    async def deliver(events):
+        for event in events:
+            await client.send(event)
+
+    async def main(loop):
+        bus.attach(loop, deliver)
+        attached.set()
+        while not client.done.is_set():
+            await asyncio.sleep(0.5)
+
+    run_loop(main)
+    attached.wait()
+    fire_callbacks(bus.publish_event)
+    client.done.wait(30)
+    return client.latencies
+
+
+def report(name, latencies):
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[int(len(ordered) * 0.99) - 1] * 1000
+    print(f"{name:<22} p50 {p50:8.3f} ms   p99 {p99:8.3f} ms   ({len(ordered)} msgs)")
+
+
+def main():
+    report("ui_bus wakeup", bench_bus())
+    report("100 ms polling (old)", bench_polling())
+
+
+if __name__ == "__main__":
+    main()
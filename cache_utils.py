@@ -0,0 +1,210 @@
+# cache_utils.py - Cache helpers bersama: TTL + stale-while-revalidate, single-flight, rate limit, JSON store
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+_MISSING = object()
+
+# Small shared pool for background revalidation
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="jarvis-refresh")
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    class _Call:
+        __slots__ = ("done", "result", "error")
+
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, "SingleFlight._Call"] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._calls
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a freshness TTL and an optional stale-while-revalidate window"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _entry(self, key: Hashable):
+        """(value, fresh) or None when missing or past the stale window"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, stored = item
+        age = time.monotonic() - stored
+        if age <= self.ttl:
+            self._data.move_to_end(key)
+            return value, True
+        if age <= self.ttl + self.stale_ttl:
+            return value, False
+        del self._data[key]
+        return None
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fresh value only"""
+        with self._lock:
+            entry = self._entry(key)
+            if entry is not None and entry[1]:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        def run():
+            value = loader()
+            self.set(key, value)
+            return value
+        return self._flight.do(key, run)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]):
+        try:
+            self._load(key, loader)
+        except Exception as e:
+            print(f"⚠️  Background refresh failed for {key!r}: {e}")
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Fresh hit, stale hit (+ background refresh) or a single-flight load"""
+        with self._lock:
+            entry = self._entry(key)
+            if entry is not None:
+                value, fresh = entry
+                if fresh:
+                    self.hits += 1
+                    return value
+                self.stale_hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            if not self._flight.in_flight(key):
+                self.refreshes += 1
+                _refresh_pool.submit(self._refresh, key, loader)
+            return entry[0]
+        return self._load(key, loader)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "shared_loads": self._flight.shared,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+class RateLimiter:
+    """Blocks so that calls are at least `min_interval` seconds apart"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.min_interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+class JsonStore:
+    """Small dict persisted to a JSON file (atomic writes)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self._data = json.load(f)
+        except (OSError, ValueError):
+            self._data = {}
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        with self._lock:
+            if default is _MISSING:
+                return self._data[key]
+            return self._data.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
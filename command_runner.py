@@ -0,0 +1,296 @@
+# command_runner.py - Runner perintah sistem async: whitelist tanpa shell, output di-stream per baris ke UI, ring buffer, cancel
+import asyncio
+import itertools
+import os
+import shlex
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import ui_bus
+
+# "time" is a cmd.exe builtin on Windows, but on POSIX /usr/bin/time runs its arguments as a command
+_DEFAULT_WHITELIST = "ls,dir,pwd,date,time,whoami,hostname" if os.name == "nt" else "ls,dir,pwd,date,whoami,hostname"
+COMMAND_WHITELIST = tuple(
+    name.strip() for name in os.getenv("COMMAND_WHITELIST", _DEFAULT_WHITELIST).split(",") if name.strip()
+)
+COMMAND_TIMEOUT = float(os.getenv("COMMAND_TIMEOUT", "30"))
+COMMAND_MAX_CONCURRENT = int(os.getenv("COMMAND_MAX_CONCURRENT", "4"))
+# Lines kept per run; older lines are dropped (they were already streamed to the UI)
+COMMAND_MAX_LINES = int(os.getenv("COMMAND_MAX_LINES", "1000"))
+MAX_LINE_CHARS = 4096
+READ_CHUNK = 64 * 1024
+# Lines arriving within this window go out as one UI event
+STREAM_FLUSH_SECONDS = 0.05
+KEEP_FINISHED = 50
+# Safe only without arguments: `date -s ...`, `hostname <name>` and `time <command>` change or run things.
+# date may still take a "+FORMAT" argument (POSIX)
+_NO_ARGUMENTS = {"date", "time", "hostname"}
+# Windows builtins that only exist inside cmd.exe
+_CMD_BUILTINS = {"dir", "date", "time"}
+_CMD_METACHARACTERS = set("&|<>^%\"")
+
+QUEUED = "queued"
+RUNNING = "running"
+FINISHED = "finished"
+FAILED = "failed"
+TIMED_OUT = "timed out"
+CANCELLED = "cancelled"
+
+
+class CommandRejected(ValueError):
+    """Command isn't on the whitelist or can't be tokenized"""
+
+
+def tokenize(command: str) -> List[str]:
+    """Split into argv without a shell; the program must be whitelisted by exact name"""
+    try:
+        argv = shlex.split(command, posix=os.name != "nt")
+    except ValueError as e:
+        raise CommandRejected(f"Cannot parse command: {e}")
+    if not argv:
+        raise CommandRejected("Empty command")
+    if argv[0] not in COMMAND_WHITELIST:
+        raise CommandRejected(f"Command not in safe list: {argv[0]} (allowed: {', '.join(COMMAND_WHITELIST)})")
+    if argv[0] in _NO_ARGUMENTS and len(argv) > 1:
+        if not (argv[0] == "date" and os.name != "nt" and len(argv) == 2 and argv[1].startswith("+")):
+            raise CommandRejected(f"{argv[0]} is only allowed without arguments")
+    if os.name == "nt" and argv[0] in _CMD_BUILTINS:
+        if any(ch in _CMD_METACHARACTERS for arg in argv for ch in arg):
+            raise CommandRejected("Shell metacharacters are not allowed")
+        argv = ["cmd", "/d", "/c"] + argv
+    return argv
+
+
+class CommandRun:
+    """One command invocation: status, exit code and the last COMMAND_MAX_LINES lines of output"""
+
+    def __init__(self, run_id: int, command: str, argv: List[str], timeout: float, publish: bool):
+        self.id = run_id
+        self.command = command
+        self.argv = argv
+        self.timeout = timeout
+        self.publish = publish
+        self.status = QUEUED
+        self.returncode: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.lines: Deque[Tuple[str, str]] = deque(maxlen=COMMAND_MAX_LINES)
+        self.line_count = 0
+        self.done = threading.Event()
+        self.future: Optional[Future] = None
+        self._pending: List[Tuple[str, str]] = []
+        self._pending_dropped = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def dropped(self) -> int:
+        return self.line_count - len(self.lines)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self.done.wait(timeout)
+
+    def output(self) -> str:
+        text = "\n".join(line if stream == "stdout" else f"[stderr] {line}" for stream, line in self.lines)
+        if self.dropped:
+            text = f"... {self.dropped} earlier lines dropped\n{text}"
+        return text
+
+    def describe(self) -> str:
+        elapsed = (self.ended or time.time()) - (self.started or self.created)
+        state = self.status
+        if self.returncode is not None:
+            state += f", exit code {self.returncode}"
+        if self.error:
+            state += f": {self.error}"
+        return f"#{self.id} `{self.command}` — {state} ({elapsed:.1f}s, {self.line_count} lines)"
+
+
+class CommandRunner:
+    """Whitelisted commands on a private asyncio loop; several run at once, each can be cancelled"""
+
+    def __init__(self, max_concurrent: int = COMMAND_MAX_CONCURRENT):
+        self.max_concurrent = max(1, max_concurrent)
+        self._ids = itertools.count(1)
+        self._runs: "OrderedDict[int, CommandRun]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    self._slots = asyncio.Semaphore(self.max_concurrent)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                threading.Thread(target=serve, name="jarvis-commands", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def start(self, command: str, timeout: float = COMMAND_TIMEOUT, publish: bool = True) -> CommandRun:
+        """Validate and launch `command`; returns immediately (raises CommandRejected)"""
+        argv = tokenize(command)
+        run = CommandRun(next(self._ids), command, argv, timeout, publish)
+        with self._lock:
+            self._runs[run.id] = run
+            finished = [r.id for r in self._runs.values() if r.done.is_set()]
+            for run_id in finished[:max(0, len(finished) - KEEP_FINISHED)]:
+                del self._runs[run_id]
+        run.future = asyncio.run_coroutine_threadsafe(self._execute(run), self._get_loop())
+        return run
+
+    def run(self, command: str, timeout: float = COMMAND_TIMEOUT, publish: bool = False) -> CommandRun:
+        """Blocking convenience wrapper: start and wait for completion"""
+        run = self.start(command, timeout, publish)
+        run.wait()
+        return run
+
+    def cancel(self, run_id: Optional[int] = None) -> List[CommandRun]:
+        """Cancel one run, or every unfinished run when no id is given"""
+        with self._lock:
+            if run_id is None:
+                targets = [r for r in self._runs.values() if not r.done.is_set()]
+            else:
+                targets = [self._runs[run_id]] if run_id in self._runs else []
+        for run in targets:
+            if run.future is not None and not run.done.is_set():
+                run.future.cancel()
+        return targets
+
+    def get(self, run_id: int) -> Optional[CommandRun]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def runs(self) -> List[CommandRun]:
+        with self._lock:
+            return list(self._runs.values())
+
+    async def _execute(self, run: CommandRun):
+        process = None
+        try:
+            async with self._slots:
+                run.status = RUNNING
+                run.started = time.time()
+                self._publish(run)
+                try:
+                    process = await asyncio.create_subprocess_exec(
+                        *run.argv, stdin=asyncio.subprocess.DEVNULL,
+                        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+                except OSError as e:
+                    run.status, run.error = FAILED, e.strerror or str(e)
+                    return
+                try:
+                    await asyncio.wait_for(self._communicate(run, process), run.timeout)
+                    run.status = FINISHED
+                except asyncio.TimeoutError:
+                    run.status = TIMED_OUT
+                    await self._kill(process)
+        except asyncio.CancelledError:
+            run.status = CANCELLED
+            if process is not None:
+                await self._kill(process)
+        finally:
+            if process is not None:
+                run.returncode = process.returncode
+            run.ended = time.time()
+            self._flush(run)
+            run.done.set()
+            self._publish(run)
+
+    async def _communicate(self, run: CommandRun, process: asyncio.subprocess.Process):
+        await asyncio.gather(self._pump(run, process.stdout, "stdout"),
+                             self._pump(run, process.stderr, "stderr"), process.wait())
+
+    async def _pump(self, run: CommandRun, stream: asyncio.StreamReader, name: str):
+        """Split a pipe into lines as bytes arrive; over-long lines are cut at MAX_LINE_CHARS"""
+        buffer = b""
+        while True:
+            chunk = await stream.read(READ_CHUNK)
+            if not chunk:
+                break
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                self._add_line(run, name, line)
+            while len(buffer) > MAX_LINE_CHARS:
+                self._add_line(run, name, buffer[:MAX_LINE_CHARS])
+                buffer = buffer[MAX_LINE_CHARS:]
+            # read() doesn't suspend while data is buffered; let timeouts, flushes and cancels run
+            await asyncio.sleep(0)
+        if buffer:
+            self._add_line(run, name, buffer)
+
+    def _add_line(self, run: CommandRun, stream: str, raw: bytes):
+        line = raw.decode("utf-8", errors="replace").rstrip("\r")[:MAX_LINE_CHARS]
+        run.lines.append((stream, line))
+        run.line_count += 1
+        if not run.publish:
+            return
+        if len(run._pending) < COMMAND_MAX_LINES:
+            run._pending.append((stream, line))
+        else:
+            # Firehose output: each UI event carries at most COMMAND_MAX_LINES, the rest is counted
+            run._pending_dropped += 1
+        if run._flush_handle is None:
+            run._flush_handle = self._loop.call_later(STREAM_FLUSH_SECONDS, self._flush, run)
+
+    def _flush(self, run: CommandRun):
+        if run._flush_handle is not None:
+            run._flush_handle.cancel()
+            run._flush_handle = None
+        if run._pending:
+            lines, run._pending = run._pending, []
+            dropped, run._pending_dropped = run._pending_dropped, 0
+            ui_bus.publish('command_output', {'run': run.id, 'command': run.command, 'lines': lines,
+                                              'dropped': dropped})
+
+    def _publish(self, run: CommandRun):
+        if run.publish:
+            ui_bus.publish('command_output', {'run': run.id, 'command': run.command, 'status': run.status,
+                                              'returncode': run.returncode, 'error': run.error})
+
+    @staticmethod
+    async def _discard(process: asyncio.subprocess.Process):
+        for stream in (process.stdout, process.stderr):
+            while await stream.read(READ_CHUNK):
+                pass
+
+    async def _kill(self, process: asyncio.subprocess.Process):
+        if process.returncode is not None:
+            return
+        # wait() only returns once the pipes hit EOF, so keep emptying them while the process dies
+        drain = asyncio.ensure_future(self._discard(process))
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), 2)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        except ProcessLookupError:
+            pass
+        finally:
+            drain.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        runs = self.runs()
+        return {
+            'runs': len(runs),
+            'running': sum(r.status == RUNNING for r in runs),
+            'queued': sum(r.status == QUEUED for r in runs),
+            'max_concurrent': self.max_concurrent,
+        }
+
+
+runner = CommandRunner()
@@ -0,0 +1,264 @@
+# email_outbox.py - Outbox email: antrian + sender background dengan koneksi SMTP hangat, retry dan mode digest
+import heapq
+import ipaddress
+import itertools
+import os
+import smtplib
+import ssl
+import threading
+import time
+from email.message import EmailMessage
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import ui_bus
+
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+# STARTTLS is required (credentials never go out in cleartext); "0" allows plaintext, loopback hosts always may
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+# Warm connection is closed after this many idle seconds
+SMTP_IDLE_TIMEOUT = float(os.getenv("SMTP_IDLE_TIMEOUT", "60"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE = float(os.getenv("EMAIL_RETRY_BASE", "2"))
+# 0 disables digest mode; otherwise messages to one recipient within the window are merged
+EMAIL_DIGEST_WINDOW = float(os.getenv("EMAIL_DIGEST_WINDOW", "0"))
+
+
+class OutgoingEmail(NamedTuple):
+    id: int
+    recipient: str
+    subject: str
+    body: str
+    attempts: int = 0
+
+
+class PermanentFailure(Exception):
+    """Rejected by the server (5xx / refused recipient / bad credentials); retrying won't help"""
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class EmailOutbox:
+    """Queued sends over one reused SMTP session, driven by a single background thread"""
+
+    def __init__(self, host: str = SMTP_HOST, port: int = SMTP_PORT, username: Optional[str] = None,
+                 password: Optional[str] = None, sender: Optional[str] = None,
+                 idle_timeout: float = SMTP_IDLE_TIMEOUT, max_attempts: int = EMAIL_MAX_ATTEMPTS,
+                 retry_base: float = EMAIL_RETRY_BASE, digest_window: float = EMAIL_DIGEST_WINDOW,
+                 require_tls: bool = SMTP_STARTTLS):
+        self.host = host
+        self.port = port
+        self.require_tls = require_tls and not is_loopback(host)
+        self._username = username
+        self._password = password
+        self._sender = sender
+        self.idle_timeout = idle_timeout
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.digest_window = digest_window
+
+        self._cond = threading.Condition()
+        # (ready_at, seq, OutgoingEmail | recipient-with-pending-digest)
+        self._queue: List[tuple] = []
+        self._digests: Dict[str, List[OutgoingEmail]] = {}
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._inflight = 0
+        self._thread: Optional[threading.Thread] = None
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self.counters = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "connections": 0, "digested": 0}
+
+    # Credentials are resolved on use so a later load_dotenv() is honoured
+    @property
+    def username(self) -> str:
+        return self._username if self._username is not None else os.getenv("EMAIL_ADDRESS", "")
+
+    @property
+    def password(self) -> str:
+        return self._password if self._password is not None else os.getenv("EMAIL_PASSWORD", "")
+
+    @property
+    def sender(self) -> str:
+        return self._sender or self.username
+
+    def send(self, recipient: str, subject: str, body: str, digest: Optional[bool] = None) -> int:
+        """Queue a message and return its id; delivery happens on the sender thread"""
+        message = OutgoingEmail(next(self._ids), recipient, subject, body)
+        digest = self.digest_window > 0 if digest is None else digest
+        with self._cond:
+            self.counters["queued"] += 1
+            if digest:
+                bucket = self._digests.get(recipient)
+                if bucket is not None:
+                    bucket.append(message)
+                    self.counters["digested"] += 1
+                    return message.id
+                self._digests[recipient] = [message]
+                heapq.heappush(self._queue, (time.time() + self.digest_window, next(self._seq), recipient))
+            else:
+                heapq.heappush(self._queue, (0.0, next(self._seq), message))
+            self._start()
+            self._cond.notify()
+        return message.id
+
+    def _start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="jarvis-email", daemon=True)
+            self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every queued message is sent or given up (True if the outbox drained)"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._cond:
+            while self._queue or self._inflight:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _next(self) -> Optional[OutgoingEmail]:
+        """Wait for the next due message, or None once the connection has sat idle. Called with the lock held."""
+        while True:
+            now = time.time()
+            if self._queue and self._queue[0][0] <= now:
+                _, _, item = heapq.heappop(self._queue)
+                if isinstance(item, str):
+                    return self._build_digest(self._digests.pop(item))
+                return item
+            if self._smtp is not None and now - self._last_used >= self.idle_timeout:
+                return None
+            wait = self._queue[0][0] - now if self._queue else None
+            if self._smtp is not None:
+                idle_left = self._last_used + self.idle_timeout - now
+                wait = idle_left if wait is None else min(wait, idle_left)
+            self._cond.wait(wait)
+
+    @staticmethod
+    def _build_digest(messages: List[OutgoingEmail]) -> OutgoingEmail:
+        if len(messages) == 1:
+            return messages[0]
+        first = messages[0]
+        sections = [f"{m.subject}\n{'-' * len(m.subject)}\n{m.body}" for m in messages]
+        return first._replace(subject=f"JARVIS digest: {len(messages)} notifications",
+                              body="\n\n".join(sections))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                message = self._next()
+                if message is not None:
+                    self._inflight += 1
+            if message is None:
+                # QUIT can take up to SMTP_TIMEOUT; never hold the lock that send() needs
+                self._close()
+                continue
+            try:
+                self._deliver(message)
+                with self._cond:
+                    self.counters["sent"] += 1
+            except PermanentFailure as e:
+                self._give_up(message, e)
+            except (smtplib.SMTPException, OSError) as e:
+                self._close()
+                attempts = message.attempts + 1
+                if attempts >= self.max_attempts:
+                    self._give_up(message, e)
+                else:
+                    delay = self.retry_base * 2 ** (attempts - 1)
+                    with self._cond:
+                        self.counters["retries"] += 1
+                        heapq.heappush(self._queue, (time.time() + delay, next(self._seq),
+                                                     message._replace(attempts=attempts)))
+            except Exception as e:
+                self._give_up(message, e)
+            finally:
+                with self._cond:
+                    self._inflight -= 1
+                    self._cond.notify_all()
+
+    def _give_up(self, message: OutgoingEmail, error: Exception):
+        with self._cond:
+            self.counters["failed"] += 1
+        print(f"⚠️  Email to {message.recipient} failed: {error}")
+        ui_bus.publish('tool_error', {'tool': 'email', 'error': f"{message.recipient}: {error}"})
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.port == 465:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=SMTP_TIMEOUT,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+            smtp.ehlo()
+            if smtp.has_extn("starttls"):
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            elif self.require_tls:
+                # Missing STARTTLS on a remote server may be a downgrade attack
+                smtp.close()
+                raise PermanentFailure(f"{self.host} does not offer STARTTLS; refusing to send "
+                                       f"credentials in cleartext (set SMTP_STARTTLS=0 to allow)")
+            else:
+                # Plaintext session (loopback stand-in such as aiosmtpd, or SMTP_STARTTLS=0): no login
+                self.counters["connections"] += 1
+                return smtp
+        if self.username and self.password and smtp.has_extn("auth"):
+            try:
+                smtp.login(self.username, self.password)
+            except smtplib.SMTPAuthenticationError as e:
+                smtp.close()
+                raise PermanentFailure(f"login failed: {e.smtp_code} {e.smtp_error!r}") from e
+        self.counters["connections"] += 1
+        return smtp
+
+    def _close(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+    def _deliver(self, message: OutgoingEmail):
+        email = EmailMessage()
+        email["From"] = self.sender
+        email["To"] = message.recipient
+        email["Subject"] = message.subject
+        email.set_content(message.body)
+
+        for reuse in (True, False):
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(email)
+                self._last_used = time.time()
+                return
+            except smtplib.SMTPServerDisconnected:
+                # Server dropped the warm connection; reconnect once right away
+                self._smtp = None
+                if not reuse:
+                    raise
+            except smtplib.SMTPRecipientsRefused as e:
+                self._last_used = time.time()
+                raise PermanentFailure(e.recipients) from e
+            except smtplib.SMTPResponseException as e:
+                if 500 <= e.smtp_code < 600:
+                    self._last_used = time.time()
+                    raise PermanentFailure(f"{e.smtp_code} {e.smtp_error!r}") from e
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return dict(self.counters, pending=len(self._queue), connected=self._smtp is not None)
+
+
+outbox = EmailOutbox()
@@ -1,51 +1,67 @@
 # enhanced_tools.py - Fitur-fitur tambahan untuk AI Assistant
 import os
-import json
-import requests
-import psutil
 import platform
 from datetime import datetime, timedelta
 from typing import Dict, Any
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import schedule
 import time
-from googletrans import Translator
-import feedparser
-import yfinance as yf
-import subprocess
-import wikipedia
-import pyautogui
-import cv2
-import numpy as np
-from geopy.geocoders import Nominatim
-import pyttsx3
-import speech_recognition as sr
-import pygame
-import qrcode
-from PIL import Image
-import io
-import base64
 from elevenlabs.conversational_ai.conversation import ClientTools
 from dotenv import load_dotenv
+from tool_executor import register_tool, time_left
+from lazy_loader import LazyResource, lazy_import, prewarm
+import weather_service
+import http_client
+from feed_cache import feed_cache
+from quote_service import normalize_symbols, quote_service, yf
+from wiki_cache import DISAMBIGUATION, MISSING, wiki_store, wikipedia
+from translation_service import translation_service
+from reminder_scheduler import parse_recurrence, scheduler as reminder_scheduler
+from system_monitor import monitor as system_monitor
+from metrics_history import history as metrics_history, parse_duration
+from email_outbox import outbox as email_outbox
+import image_analysis
+import screen_capture
+from screen_capture import parse_region
+from qr_service import QROptions, qr_service
+from artifact_server import artifacts
+from image_store import numbered_filenames
+from image_batch import image_index
+import math_engine
+from math_engine import RangeSpec
+from notes_index import index_written_file, notes_index
+from command_runner import COMMAND_TIMEOUT, FINISHED, CommandRejected, runner as command_runner
+import ui_bus
 
 load_dotenv()
 
-# Initialize services
-translator = Translator()
-geolocator = Nominatim(user_agent="jarvis-ai")
-tts_engine = pyttsx3.init()
-recognizer = sr.Recognizer()
-pygame.mixer.init()
+# Heavy dependencies are imported on first use, not at import time
+pyautogui = lazy_import("pyautogui")
+cv2 = lazy_import("cv2")
+np = lazy_import("numpy")
+pyttsx3 = lazy_import("pyttsx3")
+sr = lazy_import("speech_recognition")
+pygame = lazy_import("pygame")
+qrcode = lazy_import("qrcode")
+
+def _init_mixer():
+    pygame.mixer.init()
+    return pygame.mixer
+
+# Initialize services (lazily, on first use)
+geolocator = weather_service.geolocator
+tts_engine = LazyResource(lambda: pyttsx3.init(), "tts_engine")
+recognizer = LazyResource(lambda: sr.Recognizer(), "recognizer")
+mixer = LazyResource(_init_mixer, "mixer")
+
+def prewarm_services(wait: bool = False):
+    """Load heavy modules and services in the background before first use"""
+    return prewarm([http_client.session, yf, wikipedia, cv2, np, qrcode, translation_service, geolocator], wait=wait)
 
 # Enhanced tools for JARVIS-like features
 
 def play_audio(file_path: str):
-    pygame.mixer.init()
-    pygame.mixer.music.load(file_path)
-    pygame.mixer.music.play()
-    while pygame.mixer.music.get_busy():
+    mixer.music.load(file_path)
+    mixer.music.play()
+    while mixer.music.get_busy():
         continue
 
 
@@ -54,19 +70,15 @@ def get_weather(parameters: Dict[str, Any]) -> str:
     location = parameters.get("location", "Jakarta")
     
     try:
-        # Get coordinates
-        loc = geolocator.geocode(location)
-        if not loc:
-            return f"Location {location} not found"
-        
         # OpenWeatherMap API (you need to add API key to .env)
         api_key = os.getenv("OPENWEATHER_API_KEY", "")
         if not api_key:
             return "Weather API key not configured"
         
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={loc.latitude}&lon={loc.longitude}&appid={api_key}&units=metric"
-        response = requests.get(url)
-        data = response.json()
+        # Cached geocode + cached weather per grid cell
+        data = weather_service.get_current_weather(location, api_key)
+        if data is None:
+            return f"Location {location} not found"
         
         weather = data['weather'][0]['description']
         temp = data['main']['temp']
@@ -78,14 +90,20 @@ def get_weather(parameters: Dict[str, Any]) -> str:
         return f"Error getting weather: {str(e)}"
 
 def translate_text(parameters: Dict[str, Any]) -> str:
-    """Translate text between languages"""
+    """Translate text between languages (pass "texts" to translate a list in one request)"""
     text = parameters.get("text", "")
+    texts = parameters.get("texts")
     target_lang = parameters.get("target", "en")
     source_lang = parameters.get("source", "auto")
     
     try:
-        result = translator.translate(text, src=source_lang, dest=target_lang)
-        return f"Translation: {result.text} (from {result.src} to {target_lang})"
+        if texts:
+            results = translation_service.translate_many(texts, target_lang, source_lang)
+            return "Translations:\n" + "\n".join(f"• {r.text}" for r in results)
+        
+        result = translation_service.translate(text, target_lang, source_lang)
+        origin = f"from {result.source} " if result.source != "auto" else ""
+        return f"Translation: {result.text} ({origin}to {target_lang})"
     except Exception as e:
         return f"Translation error: {str(e)}"
 
@@ -93,135 +111,191 @@ def get_news(parameters: Dict[str, Any]) -> str:
     """Get latest news from various sources"""
     category = parameters.get("category", "technology")
     
-    feeds = {
-        "technology": "https://feeds.bbci.co.uk/news/technology/rss.xml",
-        "world": "https://feeds.bbci.co.uk/news/world/rss.xml",
-        "business": "https://feeds.bbci.co.uk/news/business/rss.xml",
-        "science": "https://feeds.bbci.co.uk/news/science_and_environment/rss.xml"
-    }
-    
     try:
-        feed_url = feeds.get(category, feeds["technology"])
-        feed = feedparser.parse(feed_url)
+        # Served from the in-memory feed cache (revalidated in background)
+        feed_cache.start()
+        entries = feed_cache.entries(category, limit=5)  # Get top 5 news
         
-        news_items = []
-        for entry in feed.entries[:5]:  # Get top 5 news
-            news_items.append(f"• {entry.title}")
+        news_items = [f"• {entry.title}" for entry in entries]
         
         return f"Latest {category} news:\n" + "\n".join(news_items)
     except Exception as e:
         return f"Error fetching news: {str(e)}"
 
 def set_reminder(parameters: Dict[str, Any]) -> str:
-    """Set a reminder/alarm"""
+    """Set a reminder/alarm (optionally recurring: repeat="every 30 minutes", "daily")"""
     message = parameters.get("message", "Reminder")
     time_str = parameters.get("time", "")
+    every = parse_recurrence(parameters.get("repeat") or time_str)
     
     try:
         # Parse time (simple implementation)
         if "minute" in time_str:
-            minutes = int(''.join(filter(str.isdigit, time_str)))
+            minutes = int(''.join(filter(str.isdigit, time_str)) or 1)
             remind_time = datetime.now() + timedelta(minutes=minutes)
         elif "hour" in time_str:
-            hours = int(''.join(filter(str.isdigit, time_str)))
+            hours = int(''.join(filter(str.isdigit, time_str)) or 1)
             remind_time = datetime.now() + timedelta(hours=hours)
+        elif every:
+            remind_time = datetime.now() + timedelta(seconds=every)
         else:
             remind_time = datetime.now() + timedelta(minutes=5)
         
-        # Save reminder to file (simple implementation)
-        with open("reminders.json", "a") as f:
-            reminder = {
-                "message": message,
-                "time": remind_time.isoformat(),
-                "created": datetime.now().isoformat()
-            }
-            f.write(json.dumps(reminder) + "\n")
+        # Persisted and fired by the background scheduler
+        reminder_scheduler.start()
+        reminder = reminder_scheduler.add(message, remind_time.timestamp(), every)
         
-        return f"Reminder set for {remind_time.strftime('%Y-%m-%d %H:%M:%S')}: {message}"
+        repeat_note = f" (repeats every {timedelta(seconds=every)})" if every else ""
+        return f"Reminder #{reminder.id} set for {remind_time.strftime('%Y-%m-%d %H:%M:%S')}: {message}{repeat_note}"
     except Exception as e:
         return f"Error setting reminder: {str(e)}"
 
 def get_system_info(parameters: Dict[str, Any]) -> Dict[str, Any]:
     """Get system information"""
     try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        network = psutil.net_io_counters()
+        # Latest snapshot from the background sampler (no 1 s cpu_percent wait)
+        sample = system_monitor.latest()
         
         return {
-            "cpu_usage": f"{cpu_percent}%",
-            "memory_usage": f"{memory.percent}%",
-            "memory_available": f"{memory.available / (1024**3):.2f} GB",
-            "disk_usage": f"{disk.percent}%",
-            "disk_free": f"{disk.free / (1024**3):.2f} GB",
-            "network_sent": f"{network.bytes_sent / (1024**2):.2f} MB",
-            "network_recv": f"{network.bytes_recv / (1024**2):.2f} MB",
+            "cpu_usage": f"{sample.cpu_percent}%",
+            "memory_usage": f"{sample.memory_percent}%",
+            "memory_available": f"{sample.memory_available / (1024**3):.2f} GB",
+            "disk_usage": f"{sample.disk_percent}%",
+            "disk_free": f"{sample.disk_free / (1024**3):.2f} GB",
+            "network_sent": f"{sample.net_sent / (1024**2):.2f} MB",
+            "network_recv": f"{sample.net_recv / (1024**2):.2f} MB",
+            "network_rate": f"↑ {sample.net_sent_rate / 1024:.1f} KB/s ↓ {sample.net_recv_rate / 1024:.1f} KB/s",
             "platform": platform.platform(),
             "processor": platform.processor()
         }
     except Exception as e:
         return {"error": str(e)}
 
-def calculate_math(parameters: Dict[str, Any]) -> str:
-    """Perform mathematical calculations"""
-    expression = parameters.get("expression", "")
+def get_metrics_history(parameters: Dict[str, Any]) -> str:
+    """Summarize CPU / memory / disk / network history (e.g. period="1h", metric="cpu")"""
+    metric = (parameters.get("metric") or "all").lower()
     
     try:
-        # Safe evaluation of mathematical expressions
-        import ast
-        import operator as op
+        seconds = parse_duration(parameters.get("period"), default=3600)
+        fields = list(metrics_history.fields) if metric == "all" else [metric]
+        if any(field not in metrics_history.fields for field in fields):
+            return f"Unknown metric '{metric}'. Available: {', '.join(metrics_history.fields)}, all"
         
-        operators = {
-            ast.Add: op.add, ast.Sub: op.sub, ast.Mult: op.mul,
-            ast.Div: op.truediv, ast.Pow: op.pow, ast.USub: op.neg
-        }
-        
-        def eval_expr(expr):
-            return eval(expr, {"__builtins__": None}, {})
+        summary = metrics_history.summary(seconds, fields)
+        if not summary:
+            return f"No metrics recorded in the last {timedelta(seconds=int(seconds))} yet"
         
-        result = eval_expr(expression)
-        return f"Result: {expression} = {result}"
+        units = {"net_sent": " B/s", "net_recv": " B/s"}
+        lines = [
+            f"• {field}: min {values['min']}{units.get(field, '%')}, "
+            f"avg {values['avg']}{units.get(field, '%')}, max {values['max']}{units.get(field, '%')}"
+            for field, values in summary.items()
+        ]
+        return f"System metrics over the last {timedelta(seconds=int(seconds))}:\n" + "\n".join(lines)
+    except Exception as e:
+        return f"Metrics history error: {str(e)}"
+
+def calculate_math(parameters: Dict[str, Any]) -> str:
+    """Perform mathematical calculations (optionally over a range: "x**2 for x from 0 to 100")"""
+    expression = parameters.get("expression", "")
+    
+    try:
+        spec = None
+        if parameters.get("variable"):
+            spec = RangeSpec(parameters["variable"], float(parameters.get("start", 0)), float(parameters["end"]),
+                             float(parameters["step"]) if parameters.get("step") else None,
+                             int(parameters["points"]) if parameters.get("points") else None)
+        return math_engine.calculate(expression, spec)
     except Exception as e:
         return f"Calculation error: {str(e)}"
 
 def take_screenshot(parameters: Dict[str, Any]) -> str:
-    """Take a screenshot"""
+    """Take a screenshot (optionally of a region "x,y,width,height")"""
     filename = parameters.get("filename", f"screenshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png")
     
     try:
-        screenshot = pyautogui.screenshot()
-        screenshot.save(filename)
+        screenshot = pyautogui.screenshot(region=parse_region(parameters.get("region")))
+        # Fast zlib level for PNG; the default level costs several times more CPU
+        screenshot.save(filename, compress_level=screen_capture.PNG_COMPRESSION)
         return f"Screenshot saved as {filename}"
     except Exception as e:
         return f"Screenshot error: {str(e)}"
 
+def watch_screen(parameters: Dict[str, Any]) -> str:
+    """Continuous screen capture: action=start|stop|status, region, fps, duration, output=ui|disk|both"""
+    action = parameters.get("action", "start")
+    
+    try:
+        if action == "stop":
+            session_id = parameters.get("session_id")
+            try:
+                session_id = int(session_id) if session_id not in (None, "") else None
+            except (TypeError, ValueError):
+                return f"Invalid session_id: {session_id!r}"
+            stopped = screen_capture.stop_session(session_id)
+            if not stopped:
+                return "No screen capture running"
+            return "\n".join(f"Stopped capture #{s.id}: {s.stats()['frames']} frames, "
+                             f"{s.stats()['skipped']} unchanged skipped" for s in stopped)
+        
+        if action == "status":
+            if not screen_capture.sessions:
+                return "No screen capture running"
+            return "\n".join(f"Capture #{s.id}: {s.stats()}" for s in screen_capture.sessions.values())
+        
+        output = parameters.get("output", "ui")
+        directory = parameters.get("directory") or os.path.join(
+            "screen_captures", datetime.now().strftime('%Y%m%d_%H%M%S'))
+        duration = parameters.get("duration")
+        session = screen_capture.start_session(
+            source=screen_capture.ScreenSource(parse_region(parameters.get("region"))),
+            fps=float(parameters.get("fps", screen_capture.CAPTURE_FPS)),
+            output_dir=directory if output in ("disk", "both") else None,
+            publish=output in ("ui", "both"),
+            duration=float(duration) if duration else None,
+        )
+        target = f" to {directory}" if session.output_dir else ""
+        return f"Screen capture #{session.id} started at {1 / session.interval:g} fps{target}"
+    except Exception as e:
+        return f"Screen capture error: {str(e)}"
+
 def search_wikipedia(parameters: Dict[str, Any]) -> str:
     """Search Wikipedia for information"""
     query = parameters.get("query", "")
     
     try:
-        result = wikipedia.summary(query, sentences=3)
-        return f"Wikipedia: {result}"
-    except wikipedia.exceptions.DisambiguationError as e:
-        return f"Multiple results found: {', '.join(e.options[:5])}"
+        # Cached on disk; identical concurrent lookups share one fetch
+        kind, payload = wiki_store.lookup(query)
+        if kind == DISAMBIGUATION:
+            return f"Multiple results found: {', '.join(payload[:5])}"
+        if kind == MISSING:
+            return f"Wikipedia: no page found for '{query}'"
+        return f"Wikipedia: {payload}"
     except Exception as e:
         return f"Wikipedia search error: {str(e)}"
 
+def _format_amount(value) -> str:
+    return f"${value:,.0f}" if value else "N/A"
+
 def get_crypto_price(parameters: Dict[str, Any]) -> str:
-    """Get cryptocurrency prices"""
-    symbol = parameters.get("symbol", "BTC-USD")
+    """Get cryptocurrency prices (one symbol or a list, fetched in one bulk request)"""
+    symbols = normalize_symbols(parameters.get("symbols") or parameters.get("symbol") or "BTC-USD")
     
     try:
-        ticker = yf.Ticker(symbol)
-        data = ticker.history(period="1d")
-        current_price = data['Close'].iloc[-1]
+        quotes = quote_service.get_quotes(symbols)
         
-        info = ticker.info
-        market_cap = info.get('marketCap', 'N/A')
-        volume = info.get('volume24Hr', 'N/A')
+        lines = []
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote is None or quote.price is None:
+                lines.append(f"{symbol}: price not available")
+                continue
+            lines.append(
+                f"{symbol} Price: ${quote.price:,.2f}, Market Cap: {_format_amount(quote.market_cap)}, "
+                f"24h Volume: {_format_amount(quote.volume)}"
+            )
         
-        return f"{symbol} Price: ${current_price:.2f}, Market Cap: ${market_cap:,}, 24h Volume: ${volume:,}"
+        return "\n".join(lines)
     except Exception as e:
         return f"Error fetching crypto price: {str(e)}"
 
@@ -243,27 +317,44 @@ def control_smart_home(parameters: Dict[str, Any]) -> str:
         return f"Smart Home: Unknown device or action"
 
 def generate_qr_code(parameters: Dict[str, Any]) -> str:
-    """Generate QR code"""
-    data = parameters.get("data", "")
-    filename = parameters.get("filename", "qrcode.png")
+    """Generate QR code(s): data or items=[...], format png|svg, deliver ui|url|none, optional save to disk"""
+    bulk = "items" in parameters
+    items = parameters.get("items") or [parameters.get("data", "")]
+    fmt = parameters.get("format", "png").lower()
+    filename = parameters.get("filename", f"qrcode.{fmt}")
+    save = parameters.get("save", not bulk or "filename" in parameters)
+    deliver = parameters.get("deliver", "ui")
     
     try:
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(data)
-        qr.make(fit=True)
+        options = QROptions(format=fmt, box_size=int(parameters.get("box_size", 10)),
+                            border=int(parameters.get("border", 5)),
+                            error_correction=parameters.get("error_correction", "M"))
+        # Rendered in memory (cached per data + options); big batches run in parallel
+        images = qr_service.generate_many(items, options)
         
-        img = qr.make_image(fill_color="black", back_color="white")
-        img.save(filename)
+        lines = []
+        for image, name in zip(images, numbered_filenames(filename, len(images)) if save else [None] * len(images)):
+            url = artifacts.put(image.filename, image.content, image.mime) if deliver == "url" else None
+            if deliver == "ui":
+                ui_bus.publish('artifact', kind='qr', name=image.filename, mime=image.mime, payload=image.content)
+            if name:
+                with open(name, "wb") as f:
+                    f.write(image.content)
+            target = ", ".join(t for t in (name, url) if t)
+            lines.append(f"{image.data[:40]}" + (f" -> {target}" if target else ""))
         
-        return f"QR code generated and saved as {filename}"
+        if not bulk and save:
+            return f"QR code generated and saved as {filename}"
+        return f"{len(images)} QR code(s) generated:\n" + "\n".join(lines)
     except Exception as e:
         return f"QR code generation error: {str(e)}"
 
 def send_email_notification(parameters: Dict[str, Any]) -> str:
-    """Send email notification"""
+    """Send email notification (queued; delivered by the background outbox)"""
     recipient = parameters.get("recipient", "")
     subject = parameters.get("subject", "JARVIS Notification")
     message = parameters.get("message", "")
+    digest = parameters.get("digest")
     
     try:
         sender_email = os.getenv("EMAIL_ADDRESS", "")
@@ -272,40 +363,49 @@ def send_email_notification(parameters: Dict[str, Any]) -> str:
         if not sender_email or not sender_password:
             return "Email credentials not configured"
         
-        msg = MIMEMultipart()
-        msg['From'] = sender_email
-        msg['To'] = recipient
-        msg['Subject'] = subject
-        
-        msg.attach(MIMEText(message, 'plain'))
+        message_id = email_outbox.send(recipient, subject, message, digest=digest)
         
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        
-        text = msg.as_string()
-        server.sendmail(sender_email, recipient, text)
-        server.quit()
-        
-        return f"Email sent to {recipient}"
+        return f"Email #{message_id} to {recipient} queued for delivery"
     except Exception as e:
         return f"Email error: {str(e)}"
 
 def run_system_command(parameters: Dict[str, Any]) -> str:
-    """Run system command (be careful with this)"""
-    command = parameters.get("command", "")
-    
-    # Whitelist safe commands
-    safe_commands = ["ls", "dir", "pwd", "date", "time", "whoami", "hostname"]
-    
-    if not any(command.startswith(cmd) for cmd in safe_commands):
-        return "Command not in safe list"
+    """Run a whitelisted command (no shell); output streams to the UI, long runs continue in the background"""
+    action = parameters.get("action", "run").lower()
     
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=5)
-        return f"Command output:\n{result.stdout}"
-    except subprocess.TimeoutExpired:
-        return "Command timed out"
+        if action == "cancel":
+            run_id = parameters.get("id")
+            cancelled = command_runner.cancel(int(run_id) if run_id not in (None, "") else None)
+            return "Cancelled: " + ", ".join(f"#{r.id}" for r in cancelled) if cancelled else "No running command to cancel"
+        if action in ("status", "list"):
+            run_id = parameters.get("id")
+            if run_id not in (None, ""):
+                run = command_runner.get(int(run_id))
+                if run is None:
+                    return f"No command #{run_id}"
+                return f"{run.describe()}\n{run.output()}"
+            runs = command_runner.runs()
+            return "\n".join(r.describe() for r in runs[-10:]) if runs else "No commands have been run"
+        
+        wait = max(0.0, float(parameters.get("wait", 5)))
+        remaining = time_left()
+        if remaining is not None:
+            # Answer "still running" before the runCommand lane deadline turns this into a ToolTimeout
+            wait = min(wait, max(0.0, remaining - 1.0))
+        
+        run = command_runner.start(parameters.get("command", ""),
+                                   timeout=float(parameters.get("timeout", COMMAND_TIMEOUT)))
+        if not run.wait(wait):
+            return (f"Command #{run.id} is still running; output is streaming to the UI. "
+                    f"Cancel it with action=cancel, id={run.id}.")
+        if run.status != FINISHED:
+            return f"Command {run.describe()}\n{run.output()}"
+        if run.returncode:
+            return f"Command exited with code {run.returncode}:\n{run.output()}"
+        return f"Command output:\n{run.output()}"
+    except CommandRejected as e:
+        return str(e)
     except Exception as e:
         return f"Command error: {str(e)}"
 
@@ -324,55 +424,112 @@ def create_note(parameters: Dict[str, Any]) -> str:
             f.write(f"# {title}\n\n")
             f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write(content)
+        index_written_file(filename)
         
         return f"Note saved as {filename}"
     except Exception as e:
         return f"Note creation error: {str(e)}"
 
+def search_notes(parameters: Dict[str, Any]) -> str:
+    """Full-text search over notes and files saved by the tools (BM25 ranking)"""
+    query = parameters.get("query", "")
+    limit = int(parameters.get("limit", 5))
+    
+    try:
+        hits = notes_index.search(query, limit=limit)
+        if not hits:
+            return f"No notes found for '{query}'"
+        lines = [f"{i}. {hit.title} ({hit.path})\n   {hit.snippet}" for i, hit in enumerate(hits, 1)]
+        return f"Notes matching '{query}':\n" + "\n".join(lines)
+    except Exception as e:
+        return f"Note search error: {str(e)}"
+
 def analyze_image(parameters: Dict[str, Any]) -> str:
     """Analyze image using OpenCV (basic analysis)"""
     image_path = parameters.get("image_path", "")
+    full_resolution = bool(parameters.get("full_resolution", False))
     
     try:
-        img = cv2.imread(image_path)
-        if img is None:
+        # Reduced-size grayscale decode + cached per-thread face detector
+        result = image_analysis.analyze(image_path, full_resolution=full_resolution)
+        if result is None:
             return "Image not found"
         
-        height, width, channels = img.shape
+        return result.summary()
+    except Exception as e:
+        return f"Image analysis error: {str(e)}"
+
+def analyze_images(parameters: Dict[str, Any]) -> str:
+    """Analyze every image in a folder (parallel; unchanged files are served from the index)"""
+    directory = parameters.get("directory", "generated_images")
+    recursive = bool(parameters.get("recursive", True))
+    
+    try:
+        if not os.path.isdir(directory):
+            return f"Folder not found: {directory}"
         
-        # Convert to grayscale for analysis
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        def report(progress):
+            ui_bus.publish('tool_status', dict(progress, tool='image_batch',
+                                               status=f"{progress['done']}/{progress['total']}"))
         
-        # Detect faces (if opencv haarcascades are available)
-        try:
-            face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-            faces = face_cascade.detectMultiScale(gray, 1.1, 4)
-            num_faces = len(faces)
-        except:
-            num_faces = "N/A"
+        stats = image_index.scan(directory, recursive=recursive, on_progress=report).snapshot()
+        if not stats['total']:
+            return f"No images found in {directory}"
         
-        # Calculate brightness
-        brightness = np.mean(gray)
+        images = stats['analyzed'] + stats['cached']
+        if images and stats['faces_unavailable'] == images:
+            faces = "unavailable (face detector not loaded)"
+        else:
+            faces = f"{stats['faces']} in {stats['images_with_faces']} images"
+            if stats['faces_unavailable']:
+                faces += f" (unavailable for {stats['faces_unavailable']} images)"
         
-        return f"Image Analysis:\n- Dimensions: {width}x{height}\n- Channels: {channels}\n- Faces detected: {num_faces}\n- Avg brightness: {brightness:.2f}"
+        return (f"Image Batch Analysis ({directory}):\n"
+                f"- Images: {stats['total']} ({stats['analyzed']} analyzed, {stats['cached']} from index, {stats['failed']} failed)\n"
+                f"- Faces detected: {faces}\n"
+                f"- Avg brightness: {stats['avg_brightness']} (min {stats['min_brightness']}, max {stats['max_brightness']})\n"
+                f"- Total: {stats['megapixels']} MP")
     except Exception as e:
-        return f"Image analysis error: {str(e)}"
+        return f"Image batch analysis error: {str(e)}"
 
 # Register all enhanced tools
-def register_enhanced_tools(client_tools: ClientTools):
-    """Register all enhanced tools with the client"""
-    client_tools.register("getWeather", get_weather)
-    client_tools.register("translateText", translate_text)
-    client_tools.register("getNews", get_news)
-    client_tools.register("setReminder", set_reminder)
-    client_tools.register("getSystemInfo", get_system_info)
-    client_tools.register("calculateMath", calculate_math)
-    client_tools.register("takeScreenshot", take_screenshot)
-    client_tools.register("searchWikipedia", search_wikipedia)
-    client_tools.register("getCryptoPrice", get_crypto_price)
-    client_tools.register("controlSmartHome", control_smart_home)
-    client_tools.register("generateQRCode", generate_qr_code)
-    client_tools.register("sendEmail", send_email_notification)
-    client_tools.register("runCommand", run_system_command)
-    client_tools.register("createNote", create_note)
-    client_tools.register("analyzeImage", analyze_image)
\ No newline at end of file
+def register_enhanced_tools(client_tools: ClientTools, warm: bool = None):
+    """Register all enhanced tools with the client (runs on the shared tool executor)
+    
+    Dependencies load on first call; pass warm=True (or set JARVIS_PREWARM=1)
+    to load them in a background thread right away.
+    """
+    if warm is None:
+        warm = os.getenv("JARVIS_PREWARM", "0") == "1"
+    if warm:
+        prewarm_services()
+    
+    # Keep news feeds warm so getNews is served from memory
+    feed_cache.start()
+    # searchNotes only reads the index; edits made outside the tools are picked up here
+    notes_index.start()
+    # Pending reminders fire (and reach the UI) even before the next setReminder call
+    reminder_scheduler.start()
+    # getSystemInfo reads from here; the UI gets live system_status pushes
+    metrics_history.attach(system_monitor)
+    system_monitor.start()
+    
+    register_tool(client_tools, "getWeather", get_weather)
+    register_tool(client_tools, "translateText", translate_text)
+    register_tool(client_tools, "getNews", get_news)
+    register_tool(client_tools, "setReminder", set_reminder)
+    register_tool(client_tools, "getSystemInfo", get_system_info)
+    register_tool(client_tools, "getMetricsHistory", get_metrics_history)
+    register_tool(client_tools, "calculateMath", calculate_math)
+    register_tool(client_tools, "takeScreenshot", take_screenshot)
+    register_tool(client_tools, "watchScreen", watch_screen)
+    register_tool(client_tools, "searchWikipedia", search_wikipedia)
+    register_tool(client_tools, "getCryptoPrice", get_crypto_price)
+    register_tool(client_tools, "controlSmartHome", control_smart_home)
+    register_tool(client_tools, "generateQRCode", generate_qr_code)
+    register_tool(client_tools, "sendEmail", send_email_notification)
+    register_tool(client_tools, "runCommand", run_system_command)
+    register_tool(client_tools, "createNote", create_note)
+    register_tool(client_tools, "searchNotes", search_notes)
+    register_tool(client_tools, "analyzeImage", analyze_image)
+    register_tool(client_tools, "analyzeImages", analyze_images)
\ No newline at end of file
@@ -0,0 +1,137 @@
+# feed_cache.py - Cache RSS dengan conditional GET (ETag / Last-Modified) dan refresh di background
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import http_client
+from cache_utils import SingleFlight
+from lazy_loader import lazy_import
+
+feedparser = lazy_import("feedparser")
+
+FEEDS = {
+    "technology": "https://feeds.bbci.co.uk/news/technology/rss.xml",
+    "world": "https://feeds.bbci.co.uk/news/world/rss.xml",
+    "business": "https://feeds.bbci.co.uk/news/business/rss.xml",
+    "science": "https://feeds.bbci.co.uk/news/science_and_environment/rss.xml"
+}
+REFRESH_INTERVAL = float(os.getenv("NEWS_REFRESH_INTERVAL", "600"))
+# Serve from memory up to this age; older entries are revalidated inline
+MAX_AGE = float(os.getenv("NEWS_MAX_AGE", str(REFRESH_INTERVAL * 3)))
+MAX_ENTRIES = 20
+
+
+class FeedEntry(NamedTuple):
+    title: str
+    link: str
+    published: str
+
+
+class _FeedState:
+    __slots__ = ("etag", "last_modified", "entries", "checked_at")
+
+    def __init__(self):
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.entries: Tuple[FeedEntry, ...] = ()
+        self.checked_at = 0.0
+
+
+class FeedCache:
+    """Parsed feed entries kept in memory, revalidated with conditional requests"""
+
+    def __init__(self, feeds: Dict[str, str], refresh_interval: float = REFRESH_INTERVAL):
+        self.feeds = dict(feeds)
+        self.refresh_interval = refresh_interval
+        self._states: Dict[str, _FeedState] = {}
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.fetches = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    def _state(self, url: str) -> _FeedState:
+        with self._lock:
+            state = self._states.get(url)
+            if state is None:
+                state = self._states[url] = _FeedState()
+            return state
+
+    def refresh(self, url: str) -> _FeedState:
+        """Revalidate one feed; a 304 keeps the cached entries"""
+        return self._flight.do(url, lambda: self._refresh(url))
+
+    def _refresh(self, url: str) -> _FeedState:
+        state = self._state(url)
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        response = http_client.get(url, headers=headers)
+        if response.status_code == 304:
+            self.not_modified += 1
+            state.checked_at = time.monotonic()
+            return state
+        response.raise_for_status()
+        self.fetches += 1
+
+        parsed = feedparser.parse(response.content)
+        entries = tuple(
+            FeedEntry(entry.get("title", ""), entry.get("link", ""), entry.get("published", ""))
+            for entry in parsed.entries[:MAX_ENTRIES]
+        )
+        # Swap in a complete snapshot; readers never see a half-updated state
+        state.entries = entries
+        state.etag = response.headers.get("ETag")
+        state.last_modified = response.headers.get("Last-Modified")
+        state.checked_at = time.monotonic()
+        return state
+
+    def entries(self, category: str, limit: int = 5) -> List[FeedEntry]:
+        """Entries for a category, from memory unless missing or too old"""
+        url = self.feeds.get(category, self.feeds["technology"])
+        state = self._state(url)
+        if not state.entries or time.monotonic() - state.checked_at > MAX_AGE:
+            state = self.refresh(url)
+        return list(state.entries[:limit])
+
+    def refresh_all(self):
+        for url in list(self.feeds.values()):
+            try:
+                self.refresh(url)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️  Feed refresh failed for {url}: {e}")
+
+    def start(self):
+        """Start the background refresher (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jarvis-feeds", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_all()
+            self._stop.wait(self.refresh_interval)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "feeds": len(self._states),
+            "fetches": self.fetches,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+        }
+
+
+feed_cache = FeedCache(FEEDS)
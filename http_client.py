@@ -0,0 +1,161 @@
+# http_client.py - HTTP client bersama (keep-alive pool per host, timeout default, metrics reuse koneksi)
+import os
+import threading
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from lazy_loader import LazyResource
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "20"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+CHUNK_SIZE = 64 * 1024
+
+USER_AGENT = "JARVIS-AI-Assistant/1.0"
+
+
+class HostStats:
+    """Per-host request / new-connection counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def _host(self, host: str) -> Dict[str, int]:
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = {"requests": 0, "connections": 0, "errors": 0}
+        return entry
+
+    def record_request(self, host: str):
+        with self._lock:
+            self._host(host)["requests"] += 1
+
+    def record_connect(self, host: str):
+        with self._lock:
+            self._host(host)["connections"] += 1
+
+    def record_error(self, host: str):
+        with self._lock:
+            self._host(host)["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for host, entry in self._hosts.items():
+                reused = max(0, entry["requests"] - entry["connections"])
+                result[host] = dict(
+                    entry,
+                    reused=reused,
+                    reuse_rate=round(reused / entry["requests"], 3) if entry["requests"] else 0.0,
+                )
+            return result
+
+
+host_stats = HostStats()
+
+
+def _build_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.util.retry import Retry
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        def _new_conn(self):
+            host_stats.record_connect(self.host)
+            return super()._new_conn()
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        def _new_conn(self):
+            host_stats.record_connect(self.host)
+            return super()._new_conn()
+
+    class PooledAdapter(HTTPAdapter):
+        """Keep-alive pools per host + default timeout + connection counting"""
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": CountingHTTPConnectionPool,
+                "https": CountingHTTPSConnectionPool,
+            }
+
+        def send(self, request, **kwargs):
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = DEFAULT_TIMEOUT
+            host = urlsplit(request.url).hostname or ""
+            host_stats.record_request(host)
+            try:
+                return super().send(request, **kwargs)
+            except Exception:
+                host_stats.record_error(host)
+                raise
+
+    retry = Retry(
+        total=RETRIES,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = PooledAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": "gzip, deflate",
+    })
+    return session
+
+
+# One session (and connection pool) for every tool
+session = LazyResource(_build_session, "http_session")
+
+
+def request(method: str, url: str, **kwargs):
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return session.request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
+
+
+def stream(url: str, **kwargs):
+    """GET with a streamed body; use as a context manager and iterate response.iter_content()"""
+    kwargs["stream"] = True
+    return request("GET", url, **kwargs)
+
+
+def download(url: str, path: str, chunk_size: int = CHUNK_SIZE, **kwargs) -> int:
+    """Stream a response body to disk without holding it in memory; returns bytes written"""
+    written = 0
+    tmp = f"{path}.part"
+    try:
+        with stream(url, **kwargs) as response:
+            response.raise_for_status()
+            with open(tmp, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return written
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Per-host requests, new connections and reuse rate"""
+    return host_stats.snapshot()
@@ -0,0 +1,224 @@
+# image_batch.py - Analisis gambar massal per folder: process pool + index hasil (path, mtime, size) di SQLite
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import image_analysis
+from system_monitor import available_cpus
+
+IMAGE_INDEX_FILE = os.getenv("IMAGE_INDEX_FILE", "image_index.db")
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp", ".tif", ".tiff"}
+BATCH_WORKERS = int(os.getenv("IMAGE_BATCH_WORKERS", "0")) or available_cpus()
+# Minimum seconds between streamed progress updates
+PROGRESS_INTERVAL = 0.5
+
+
+class ImageRecord(NamedTuple):
+    path: str
+    mtime: float
+    size: int
+    width: int
+    height: int
+    faces: int  # -1 when face detection isn't available
+    brightness: float
+
+
+def _init_worker():
+    # One OpenCV thread per process; the pool already uses every core
+    image_analysis.cv2.setNumThreads(1)
+
+
+def _analyze_file(job: Tuple[str, float, int]) -> Optional[ImageRecord]:
+    """Runs in a pool process; returns plain values only (cheap to pickle)"""
+    path, mtime, size = job
+    result = image_analysis.analyze(path)
+    if result is None:
+        return None
+    faces = -1 if result.faces is None else len(result.faces)
+    return ImageRecord(path, mtime, size, result.width, result.height, faces, result.brightness)
+
+
+class BatchStats:
+    """Running aggregates, updated as each result arrives"""
+
+    def __init__(self):
+        self.total = 0
+        self.analyzed = 0
+        self.cached = 0
+        self.failed = 0
+        self.faces = 0
+        self.with_faces = 0
+        self.faces_unavailable = 0
+        self.brightness_sum = 0.0
+        self.brightness_min = None
+        self.brightness_max = None
+        self.pixels = 0
+
+    def add(self, record: ImageRecord, cached: bool):
+        if cached:
+            self.cached += 1
+        else:
+            self.analyzed += 1
+        if record.faces < 0:
+            self.faces_unavailable += 1
+        elif record.faces > 0:
+            self.faces += record.faces
+            self.with_faces += 1
+        self.brightness_sum += record.brightness
+        self.brightness_min = record.brightness if self.brightness_min is None else min(self.brightness_min, record.brightness)
+        self.brightness_max = record.brightness if self.brightness_max is None else max(self.brightness_max, record.brightness)
+        self.pixels += record.width * record.height
+
+    @property
+    def done(self) -> int:
+        return self.analyzed + self.cached + self.failed
+
+    def snapshot(self) -> Dict[str, Any]:
+        images = self.analyzed + self.cached
+        return {
+            'total': self.total,
+            'done': self.done,
+            'analyzed': self.analyzed,
+            'cached': self.cached,
+            'failed': self.failed,
+            'faces': self.faces,
+            'images_with_faces': self.with_faces,
+            'faces_unavailable': self.faces_unavailable,
+            'avg_brightness': round(self.brightness_sum / images, 2) if images else None,
+            'min_brightness': None if self.brightness_min is None else round(self.brightness_min, 2),
+            'max_brightness': None if self.brightness_max is None else round(self.brightness_max, 2),
+            'megapixels': round(self.pixels / 1e6, 1),
+        }
+
+
+class ImageIndex:
+    """Analysis results keyed by path; a row is reused while (mtime, size) still match the file"""
+
+    def __init__(self, path: str = IMAGE_INDEX_FILE, workers: int = BATCH_WORKERS):
+        self.path = path
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS images ("
+                "path TEXT PRIMARY KEY, mtime REAL NOT NULL, size INTEGER NOT NULL, width INTEGER NOT NULL, "
+                "height INTEGER NOT NULL, faces INTEGER NOT NULL, brightness REAL NOT NULL, analyzed_at REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def pool(self) -> ProcessPoolExecutor:
+        """Shared process pool, started on first batch (spawn: the parent runs threads)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _known(self, directory: str) -> Dict[str, ImageRecord]:
+        prefix = os.path.join(directory, "")
+        # Range scan on the primary key: every path that starts with `prefix`
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT path, mtime, size, width, height, faces, brightness FROM images "
+                "WHERE path >= ? AND path < ?", (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+            ).fetchall()
+        return {row[0]: ImageRecord(*row) for row in rows}
+
+    def _save(self, records: List[ImageRecord]):
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            db.executemany(
+                "INSERT OR REPLACE INTO images (path, mtime, size, width, height, faces, brightness, analyzed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [tuple(r) + (now,) for r in records]
+            )
+            db.commit()
+
+    def _forget(self, paths: List[str]):
+        with self._lock:
+            db = self._conn()
+            db.executemany("DELETE FROM images WHERE path = ?", [(p,) for p in paths])
+            db.commit()
+
+    @staticmethod
+    def _walk(directory: str, recursive: bool) -> Iterator[Tuple[str, float, int]]:
+        for root, dirs, files in os.walk(directory):
+            if not recursive:
+                dirs.clear()
+            for name in files:
+                if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def scan(self, directory: str, recursive: bool = True,
+             on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> BatchStats:
+        """Analyze new/changed images under `directory` in parallel; unchanged ones come from the index"""
+        directory = os.path.abspath(directory)
+        known = self._known(directory)
+        if not recursive:
+            known = {p: r for p, r in known.items() if os.path.dirname(p) == directory}
+        stats = BatchStats()
+        jobs = []
+        for path, mtime, size in self._walk(directory, recursive):
+            stats.total += 1
+            record = known.pop(path, None)
+            if record is not None and record.mtime == mtime and record.size == size:
+                stats.add(record, cached=True)
+            else:
+                jobs.append((path, mtime, size))
+        # Whatever is left in `known` no longer exists on disk
+        if known:
+            self._forget(list(known))
+
+        last_report = 0.0
+        if jobs:
+            pool = self.pool()
+            pending: List[ImageRecord] = []
+            futures = [pool.submit(_analyze_file, job) for job in jobs]
+            for future in as_completed(futures):
+                try:
+                    record = future.result()
+                except Exception:
+                    record = None
+                if record is None:
+                    stats.failed += 1
+                else:
+                    stats.add(record, cached=False)
+                    pending.append(record)
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    last_report = now
+                    if pending:
+                        self._save(pending)
+                        pending = []
+                    if on_progress:
+                        on_progress(stats.snapshot())
+            if pending:
+                self._save(pending)
+        if on_progress:
+            on_progress(stats.snapshot())
+        return stats
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+image_index = ImageIndex()
@@ -0,0 +1,119 @@
+# image_store.py - Pipeline generate gambar: download streaming ke disk, store content-addressed per (prompt, size, model)
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional
+
+import http_client
+from cache_utils import SingleFlight
+from lazy_loader import LazyResource
+
+STORE_DIR = os.getenv("IMAGE_STORE_DIR", os.path.join("generated_images", ".store"))
+DEFAULT_MODEL = "dall-e-3"
+DEFAULT_SIZE = "1024x1024"
+DEFAULT_QUALITY = "standard"
+# DALL-E returns PNG; other extensions need a conversion
+NATIVE_FORMAT = "png"
+MAX_PARALLEL = int(os.getenv("IMAGE_MAX_PARALLEL", "4"))
+
+
+def _build_openai():
+    import openai
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+openai_client = LazyResource(_build_openai, "openai")
+_flight = SingleFlight()
+_pool = ThreadPoolExecutor(max_workers=MAX_PARALLEL, thread_name_prefix="jarvis-image")
+
+
+class GeneratedImage(NamedTuple):
+    path: str
+    key: str
+    cached: bool
+    url: Optional[str]
+
+
+def image_key(prompt: str, size: str = DEFAULT_SIZE, model: str = DEFAULT_MODEL,
+              quality: str = DEFAULT_QUALITY) -> str:
+    raw = "\0".join((model, size, quality, prompt.strip()))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def blob_path(key: str) -> str:
+    return os.path.join(STORE_DIR, key[:2], f"{key}.{NATIVE_FORMAT}")
+
+
+def _generate_blob(key: str, prompt: str, size: str, model: str, quality: str) -> Optional[str]:
+    """Call the API and stream the result straight into the store (no decode/re-encode)"""
+    response = openai_client.images.generate(prompt=prompt, model=model, n=1, size=size, quality=quality)
+    url = response.data[0].url
+    path = blob_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    http_client.download(url, path)
+    with open(f"{path[:-len(NATIVE_FORMAT) - 1]}.json", "w", encoding="utf-8") as f:
+        json.dump({"prompt": prompt, "size": size, "model": model, "quality": quality, "url": url}, f)
+    return url
+
+
+def _materialize(blob: str, target: str):
+    """Place the stored image at `target`: link/copy if same format, convert only when needed"""
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    ext = os.path.splitext(target)[1].lower().lstrip(".")
+    if ext in ("", NATIVE_FORMAT):
+        if os.path.exists(target):
+            os.remove(target)
+        try:
+            os.link(blob, target)
+        except OSError:
+            shutil.copyfile(blob, target)
+        return
+    from PIL import Image
+    with Image.open(blob) as image:
+        if ext in ("jpg", "jpeg") and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(target)
+
+
+def generate(prompt: str, filename: Optional[str] = None, save_dir: str = "generated_images",
+             size: str = DEFAULT_SIZE, model: str = DEFAULT_MODEL, quality: str = DEFAULT_QUALITY) -> GeneratedImage:
+    """Generate (or reuse) an image; repeat prompts return the stored file immediately"""
+    key = image_key(prompt, size, model, quality)
+    blob = blob_path(key)
+    cached = os.path.exists(blob)
+    url = None
+    if not cached:
+        url = _flight.do(key, lambda: _generate_blob(key, prompt, size, model, quality))
+    if not filename:
+        return GeneratedImage(blob, key, cached, url)
+    target = os.path.join(save_dir, filename)
+    _materialize(blob, target)
+    return GeneratedImage(target, key, cached, url)
+
+
+def numbered_filenames(filename: Optional[str], count: int) -> List[Optional[str]]:
+    """image.png -> image_1.png, image_2.png, ... when several images are requested"""
+    if count == 1 or not filename:
+        return [filename] * count
+    stem, ext = os.path.splitext(filename)
+    return [f"{stem}_{i + 1}{ext}" for i in range(count)]
+
+
+def generate_many(prompts: List[str], filenames: Optional[List[str]] = None, **options) -> List[GeneratedImage]:
+    """Issue several generations concurrently (DALL-E 3 only allows n=1 per request)"""
+    filenames = filenames or [None] * len(prompts)
+    futures = [_pool.submit(generate, prompt, filename, **options) for prompt, filename in zip(prompts, filenames)]
+    return [future.result() for future in futures]
+
+
+def stats() -> Dict[str, int]:
+    count = size = 0
+    if os.path.isdir(STORE_DIR):
+        for root, _, files in os.walk(STORE_DIR):
+            for name in files:
+                if name.endswith(f".{NATIVE_FORMAT}"):
+                    count += 1
+                    size += os.path.getsize(os.path.join(root, name))
+    return {"images": count, "bytes": size}
@@ -137,7 +137,10 @@ class JarvisLauncher:
     def monitor_system(self):
         """Monitor system status"""
         try:
-            import psutil
+            from system_monitor import SystemMonitor
+            # Launcher process has no UI bus sink, so skip publishing
+            sampler = SystemMonitor(publish=False)
+            sampler.start()
             
             layout = Layout()
             layout.split_column(
@@ -148,8 +151,7 @@ class JarvisLauncher:
             
             while self.is_running:
                 # System stats
-                cpu = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
+                sample = sampler.latest()
                 
                 # Update time
                 uptime = datetime.now() - self.start_time if self.start_time else "N/A"
@@ -161,8 +163,9 @@ class JarvisLauncher:
                 
                 table.add_row("Status", "🟢 Running")
                 table.add_row("Uptime", str(uptime).split('.')[0])
-                table.add_row("CPU Usage", f"{cpu}%")
-                table.add_row("Memory Usage", f"{memory.percent}%")
+                table.add_row("CPU Usage", f"{sample.cpu_percent}%")
+                table.add_row("Memory Usage", f"{sample.memory_percent}%")
+                table.add_row("Network", f"↑ {sample.net_sent_rate / 1024:.1f} KB/s ↓ {sample.net_recv_rate / 1024:.1f} KB/s")
                 table.add_row("Backend", "http://localhost:5000")
                 table.add_row("WebSocket", "ws://localhost:8765")
                 
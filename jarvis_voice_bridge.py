@@ -9,6 +9,8 @@ import threading
 import queue
 from datetime import datetime
 from dotenv import load_dotenv
+import ui_bus
+from ui_clients import ClientHub
 
 # Import existing modules
 from tools import client_tools
@@ -61,7 +63,7 @@ class VoiceBridge:
     def __init__(self):
         self.conversation = None
         self.is_active = False
-        self.clients = set()
+        self.clients = ClientHub()  # per-client bounded send queues
         
     async def register_client(self, websocket):
         """Register new WebSocket client"""
@@ -87,11 +89,13 @@ class VoiceBridge:
             self.unregister_client(websocket)
     
     async def broadcast(self, data):
-        """Broadcast message to all clients"""
-        if self.clients:
-            await asyncio.gather(
-                *[self.send_to_client(client, data) for client in self.clients]
-            )
+        """Broadcast message to all clients (queued per client, never blocks)"""
+        self.clients.publish(data)
+    
+    async def deliver_ui_events(self, events):
+        """Deliver a batch of tool events from the UI bus"""
+        for event in events:
+            await self.broadcast(event)
     
     def start_voice_conversation(self):
         """Start ElevenLabs conversation"""
@@ -159,7 +163,11 @@ class VoiceBridge:
         """Handle messages from UI client"""
         action = data.get('action')
         
-        if action == 'start_listening':
+        if action == 'hello':
+            # Client negotiates its wire encoding (json / binary)
+            self.clients.set_encoding(websocket, data.get('encoding', 'json'))
+        
+        elif action == 'start_listening':
             if DEMO_MODE:
                 # Demo mode simulation
                 await self.send_to_client(websocket, {
@@ -266,6 +274,7 @@ def start_http_server():
 async def main():
     """Main async function"""
     bridge = VoiceBridge()
+    ui_bus.bus.attach(asyncio.get_running_loop(), bridge.deliver_ui_events)
     
     # Start HTTP server in thread
     http_thread = threading.Thread(target=start_http_server, daemon=True)
@@ -9,6 +9,8 @@ import threading
 import queue
 from datetime import datetime
 from dotenv import load_dotenv
+import ui_bus
+from ui_clients import ClientHub
 
 # Import existing modules
 try:
@@ -58,8 +60,8 @@ else:
     elevenlabs = ElevenLabs(api_key=api_key)
     print("✅ Voice AI Ready")
 
-# Global clients set for WebSocket connections
-clients = set()
+# Connected WebSocket clients, each with its own bounded send queue
+clients = ClientHub()
 
 async def register_client(websocket):
     """Register new WebSocket client"""
@@ -78,17 +80,13 @@ def unregister_client(websocket):
     print(f"Client disconnected. Total: {len(clients)}")
 
 async def broadcast(data):
-    """Broadcast to all connected clients"""
-    if clients:
-        disconnected = set()
-        for client in clients:
-            try:
-                await client.send(json.dumps(data))
-            except:
-                disconnected.add(client)
-        # Remove disconnected clients
-        for client in disconnected:
-            unregister_client(client)
+    """Broadcast to all connected clients (queued per client, never blocks)"""
+    clients.publish(data)
+
+async def deliver_ui_events(events):
+    """Deliver a batch of tool events from the UI bus"""
+    for event in events:
+        await broadcast(event)
 
 def start_voice_conversation():
     """Start ElevenLabs conversation"""
@@ -152,7 +150,11 @@ async def handle_websocket(websocket, path):
                 data = json.loads(message)
                 action = data.get('action')
                 
-                if action == 'start_listening':
+                if action == 'hello':
+                    # Client negotiates its wire encoding (json / binary)
+                    clients.set_encoding(websocket, data.get('encoding', 'json'))
+                
+                elif action == 'start_listening':
                     if DEMO_MODE:
                         # Demo mode
                         await websocket.send(json.dumps({
@@ -246,6 +248,9 @@ def start_http_server():
 
 async def main():
     """Main function"""
+    # Route tool events straight to connected clients
+    ui_bus.bus.attach(asyncio.get_running_loop(), deliver_ui_events)
+    
     # Start HTTP server in thread
     http_thread = threading.Thread(target=start_http_server, daemon=True)
     http_thread.start()
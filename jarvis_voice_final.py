@@ -7,10 +7,11 @@ import websockets
 import json
 import threading
 import webbrowser
-import queue
 from datetime import datetime
 from dotenv import load_dotenv
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+import ui_bus
+from ui_clients import ClientHub
 
 # Load environment
 load_dotenv()
@@ -37,13 +38,10 @@ print("\n🔑 Checking credentials...")
 print(f"  AGENT_ID: {'✅ Found' if agent_id else '❌ Not found'}")
 print(f"  API_KEY: {'✅ Found' if api_key else '❌ Not found'}")
 
-# Message queue for thread-safe communication
-message_queue = queue.Queue()
-
 # Global variables
 VOICE_ENABLED = False
 conversation = None
-clients = set()
+clients = ClientHub()  # per-client bounded send queues
 main_loop = None  # Store main event loop
 
 # Try to initialize voice
@@ -68,38 +66,23 @@ if agent_id and api_key:
         print(f"❌ Voice init error: {e}")
 
 async def broadcast(data):
-    """Broadcast to all connected clients"""
-    if clients:
-        disconnected = []
-        for client in clients:
-            try:
-                await client.send(json.dumps(data))
-            except:
-                disconnected.append(client)
-        for client in disconnected:
-            clients.discard(client)
+    """Broadcast to all connected clients (queued per client, never blocks)"""
+    clients.publish(data)
 
-async def process_message_queue():
-    """Process messages from queue (runs in main event loop)"""
-    while True:
-        try:
-            # Check for messages in queue
-            while not message_queue.empty():
-                msg = message_queue.get_nowait()
-                await broadcast(msg)
-        except:
-            pass
-        await asyncio.sleep(0.1)  # Small delay to prevent CPU spinning
+async def deliver_ui_events(events):
+    """Deliver a batch of tool events from the UI bus"""
+    for event in events:
+        await broadcast(event)
 
 def queue_message(msg_type, text, **kwargs):
-    """Queue a message to be sent (thread-safe)"""
+    """Hand a message to the main loop (thread-safe, delivered immediately)"""
     message = {
         'type': msg_type,
         'text': text,
         'timestamp': datetime.now().isoformat()
     }
     message.update(kwargs)
-    message_queue.put(message)
+    ui_bus.bus.publish_event(message)
 
 def start_voice_session():
     """Start ElevenLabs voice conversation with fixed callbacks"""
@@ -119,7 +102,7 @@ def start_voice_session():
             requires_auth=True,
             audio_interface=DefaultAudioInterface(),
             
-            # Thread-safe callbacks using queue
+            # Thread-safe callbacks via the UI bus (wakes the main loop)
             callback_agent_response=lambda response: queue_message('response', response),
             callback_user_transcript=lambda transcript: queue_message('transcript', transcript),
             callback_agent_response_correction=lambda original, corrected: queue_message(
@@ -172,7 +155,11 @@ async def handle_websocket(websocket):
             data = json.loads(message)
             action = data.get('action')
             
-            if action == 'start_listening':
+            if action == 'hello':
+                # Client negotiates its wire encoding (json / binary)
+                clients.set_encoding(websocket, data.get('encoding', 'json'))
+            
+            elif action == 'start_listening':
                 if VOICE_ENABLED:
                     if start_voice_session():
                         await websocket.send(json.dumps({
@@ -237,6 +224,7 @@ async def main():
     """Main function with proper event loop"""
     global main_loop
     main_loop = asyncio.get_event_loop()
+    ui_bus.bus.attach(main_loop, deliver_ui_events)
     
     # Check HTML
     if not os.path.exists('templates/index.html'):
@@ -250,9 +238,6 @@ async def main():
     # Open browser
     threading.Timer(2, lambda: webbrowser.open('http://localhost:5000')).start()
     
-    # Start message queue processor
-    asyncio.create_task(process_message_queue())
-    
     print("🔌 WebSocket at ws://localhost:8765")
     print("\n📊 Status:")
     print(f"  • Voice: {'✅ ENABLED' if VOICE_ENABLED else '❌ DISABLED'}")
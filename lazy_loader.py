@@ -0,0 +1,86 @@
+# lazy_loader.py - Import modul berat dan init service hanya saat pertama kali dipakai
+import importlib
+import threading
+from typing import Any, Callable, Iterable
+
+
+class LazyModule:
+    """Stand-in for a module; the real import happens on first attribute access"""
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+        self.__dict__["_lock"] = threading.Lock()
+
+    def load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            with self.__dict__["_lock"]:
+                module = self.__dict__["_module"]
+                if module is None:
+                    module = importlib.import_module(self.__dict__["_name"])
+                    self.__dict__["_module"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyModule {self.__dict__['_name']} ({state})>"
+
+
+class LazyResource:
+    """Proxy for an object built by `factory` on first use (thread-safe, built once)"""
+
+    def __init__(self, factory: Callable[[], Any], name: str = ""):
+        self.__dict__["_factory"] = factory
+        self.__dict__["_name"] = name or getattr(factory, "__name__", "resource")
+        self.__dict__["_value"] = None
+        self.__dict__["_ready"] = False
+        self.__dict__["_lock"] = threading.Lock()
+
+    def load(self):
+        if not self.__dict__["_ready"]:
+            with self.__dict__["_lock"]:
+                if not self.__dict__["_ready"]:
+                    self.__dict__["_value"] = self.__dict__["_factory"]()
+                    self.__dict__["_ready"] = True
+        return self.__dict__["_value"]
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_ready"]
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<LazyResource {self.__dict__['_name']} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def prewarm(items: Iterable, wait: bool = False) -> threading.Thread:
+    """Load lazy modules/resources in the background so first use is fast"""
+    items = list(items)
+
+    def run():
+        for item in items:
+            try:
+                item.load()
+            except Exception as e:
+                print(f"⚠️  Prewarm failed for {item!r}: {e}")
+
+    thread = threading.Thread(target=run, name="jarvis-prewarm", daemon=True)
+    thread.start()
+    if wait:
+        thread.join()
+    return thread
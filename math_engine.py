@@ -0,0 +1,266 @@
+# math_engine.py - Evaluator ekspresi matematika: AST whitelist, cache hasil compile, evaluasi vektor numpy untuk range
+import ast
+import math
+import operator
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from lazy_loader import lazy_import
+
+np = lazy_import("numpy")
+
+MAX_POINTS = int(os.getenv("MATH_MAX_POINTS", "10000000"))
+DEFAULT_POINTS = 1001
+# Integer results above this many bits (~300k digits) are refused before they are computed:
+# (10**1000)**10000 alone would burn seconds of CPU and hold the calculateMath lane
+MAX_INT_BITS = 1_000_000
+SAMPLE_COUNT = 5
+
+_BIN_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+_UNARY_OPS = (ast.UAdd, ast.USub)
+_COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+
+# name: (scalar implementation, numpy ufunc name)
+FUNCTIONS = {
+    "sin": (math.sin, "sin"), "cos": (math.cos, "cos"), "tan": (math.tan, "tan"),
+    "asin": (math.asin, "arcsin"), "acos": (math.acos, "arccos"), "atan": (math.atan, "arctan"),
+    "atan2": (math.atan2, "arctan2"),
+    "sinh": (math.sinh, "sinh"), "cosh": (math.cosh, "cosh"), "tanh": (math.tanh, "tanh"),
+    "exp": (math.exp, "exp"), "log": (math.log, "log"), "ln": (math.log, "log"),
+    "log10": (math.log10, "log10"), "log2": (math.log2, "log2"), "sqrt": (math.sqrt, "sqrt"),
+    "abs": (abs, "abs"), "floor": (math.floor, "floor"), "ceil": (math.ceil, "ceil"),
+    "round": (round, "round"), "min": (min, "minimum"), "max": (max, "maximum"),
+    "hypot": (math.hypot, "hypot"), "degrees": (math.degrees, "degrees"), "radians": (math.radians, "radians"),
+}
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+
+_RANGE = re.compile(
+    r"^(?P<expr>.+?)\s*(?:,|;|\b(?:where|for|with)\b)\s*(?P<var>[a-zA-Z_]\w*)\s+(?:from|in|=)\s+"
+    r"(?P<start>.+?)\s+(?:to|\.\.)\s+(?P<end>.+?)"
+    r"(?:\s+(?:step|by)\s+(?P<step>.+?))?(?:\s+(?:points|samples)\s+(?P<points>\d+))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def _int_bits_ok(bits: int):
+    if bits > MAX_INT_BITS:
+        raise ValueError(f"Result too large (over {MAX_INT_BITS} bits)")
+
+
+def _safe_pow(base, exponent):
+    """** with the result size estimated up front for integer operands"""
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        _int_bits_ok(exponent * base.bit_length())
+    return base ** exponent
+
+
+def _safe_mul(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        _int_bits_ok(left.bit_length() + right.bit_length())
+    return left * right
+
+
+def _vector_op(scalar_op, array_op):
+    """Array operands go to numpy; scalar sub-expressions keep the size checks"""
+    def apply(left, right):
+        if isinstance(left, (int, float, complex)) and isinstance(right, (int, float, complex)):
+            return scalar_op(left, right)
+        return array_op(left, right)
+    return apply
+
+
+class _Validator(ast.NodeTransformer):
+    """Reject anything outside the arithmetic whitelist; route ** and * through size-checked helpers"""
+
+    def __init__(self):
+        self.variables = set()
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id in FUNCTIONS:
+            raise ValueError(f"{node.id} is a function; call it like {node.id}(x)")
+        if node.id not in CONSTANTS:
+            self.variables.add(node.id)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, _UNARY_OPS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _BIN_OPS):
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left, right = self.visit(node.left), self.visit(node.right)
+        helper = "_pow" if isinstance(node.op, ast.Pow) else "_mul" if isinstance(node.op, ast.Mult) else None
+        if helper:
+            call = ast.Call(func=ast.Name(id=helper, ctx=ast.Load()), args=[left, right], keywords=[])
+            return ast.copy_location(call, node)
+        node.left, node.right = left, right
+        return node
+
+    def visit_Compare(self, node):
+        if not all(isinstance(op, _COMPARE_OPS) for op in node.ops):
+            raise ValueError("Unsupported comparison")
+        node.left = self.visit(node.left)
+        node.comparators = [self.visit(c) for c in node.comparators]
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise ValueError(f"Unsupported function: {ast.unparse(node.func)}")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+class CompiledExpression(NamedTuple):
+    source: str
+    code: Any
+    variables: frozenset
+
+
+def normalize(expression: str) -> str:
+    """Spoken / typed forms: '^' for power, '×' and '÷'"""
+    return expression.strip().replace("^", "**").replace("×", "*").replace("÷", "/")
+
+
+@lru_cache(maxsize=512)
+def compile_expression(expression: str) -> CompiledExpression:
+    """Parse + validate once; repeat expressions reuse the code object"""
+    source = normalize(expression)
+    tree = ast.parse(source, mode="eval")
+    validator = _Validator()
+    tree = ast.fix_missing_locations(validator.visit(tree))
+    return CompiledExpression(source, compile(tree, "<math>", "eval"), frozenset(validator.variables))
+
+
+_SCALAR_NAMESPACE = dict(CONSTANTS, _pow=_safe_pow, _mul=_safe_mul,
+                         **{name: impl for name, (impl, _) in FUNCTIONS.items()})
+_vector_namespace: Optional[Dict[str, Any]] = None
+
+
+def _vector_functions() -> Dict[str, Any]:
+    global _vector_namespace
+    if _vector_namespace is None:
+        _vector_namespace = dict(CONSTANTS, _pow=_vector_op(_safe_pow, np.power),
+                                 _mul=_vector_op(_safe_mul, operator.mul),
+                                 **{name: getattr(np, ufunc) for name, (_, ufunc) in FUNCTIONS.items()})
+    return _vector_namespace
+
+
+def evaluate(expression: str, variables: Optional[Dict[str, Any]] = None):
+    """Evaluate with scalar math, or in one numpy pass when any variable is an array"""
+    compiled = compile_expression(expression)
+    variables = variables or {}
+    missing = compiled.variables - set(variables)
+    if missing:
+        raise ValueError(f"Unknown name(s): {', '.join(sorted(missing))}")
+    vector = any(not isinstance(v, (int, float, complex)) for v in variables.values())
+    if not vector:
+        return eval(compiled.code, {"__builtins__": {}}, dict(_SCALAR_NAMESPACE, **variables))
+    # Domain errors become nan/inf per element and are reported in the summary
+    with np.errstate(all="ignore"):
+        return eval(compiled.code, {"__builtins__": {}}, dict(_vector_functions(), **variables))
+
+
+class RangeSpec(NamedTuple):
+    variable: str
+    start: float
+    end: float
+    step: Optional[float] = None
+    points: Optional[int] = None
+
+    def values(self):
+        if self.step is not None:
+            if self.step == 0:
+                raise ValueError("step must not be 0")
+            count = int(math.floor((self.end - self.start) / self.step + 1e-9)) + 1
+            if count > MAX_POINTS or count < 1:
+                raise ValueError(f"Range would have {count} points (limit {MAX_POINTS})")
+            return self.start + np.arange(count, dtype=np.float64) * self.step
+        points = self.points
+        if points is None:
+            span = self.end - self.start
+            # Whole-number bounds: every integer if that fits, like "x from 0 to 10000" (or 10 down to 0)
+            if float(self.start).is_integer() and float(self.end).is_integer() and abs(span) < MAX_POINTS:
+                direction = 1 if span >= 0 else -1
+                return np.arange(self.start, self.end + direction, direction, dtype=np.float64)
+            points = DEFAULT_POINTS
+        if points > MAX_POINTS:
+            raise ValueError(f"Too many points (limit {MAX_POINTS})")
+        return np.linspace(self.start, self.end, points)
+
+
+def parse_query(text: str) -> Tuple[str, Optional[RangeSpec]]:
+    """'x**2 for x from 0 to 10 step 0.5' -> ('x**2', RangeSpec(...)); plain expressions -> (text, None)"""
+    match = _RANGE.match(text.strip())
+    if not match:
+        return text, None
+    number = lambda part: float(evaluate(part)) if part else None
+    points = match.group("points")
+    return match.group("expr"), RangeSpec(match.group("var"), number(match.group("start")),
+                                          number(match.group("end")), number(match.group("step")),
+                                          int(points) if points else None)
+
+
+def format_number(value) -> str:
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, int):
+        try:
+            return str(value)
+        except ValueError:
+            # Past Python's int->str digit limit: scientific form from log10 (exact for big ints)
+            exponent = math.floor(math.log10(abs(value)))
+            mantissa = 10 ** (math.log10(abs(value)) - exponent)
+            return f"{'-' if value < 0 else ''}{mantissa:.10g}e+{exponent}"
+    if isinstance(value, complex):
+        return f"{value.real:.12g}{value.imag:+.12g}j"
+    return f"{float(value):.12g}"
+
+
+def summarize(expression: str, spec: RangeSpec, xs, ys) -> str:
+    """Statistics + a few evenly spaced samples instead of the full series"""
+    ys = np.broadcast_to(np.asarray(ys, dtype=np.float64), xs.shape)
+    finite = np.isfinite(ys)
+    lines = [f"{expression} for {spec.variable} from {format_number(xs[0])} to {format_number(xs[-1])} "
+             f"({len(xs)} points):"]
+    if finite.any():
+        valid_x, valid_y = xs[finite], ys[finite]
+        low, high = int(np.argmin(valid_y)), int(np.argmax(valid_y))
+        lines += [
+            f"- min: {format_number(valid_y[low])} at {spec.variable}={format_number(valid_x[low])}",
+            f"- max: {format_number(valid_y[high])} at {spec.variable}={format_number(valid_x[high])}",
+            f"- mean: {format_number(valid_y.mean())}",
+            f"- sum: {format_number(valid_y.sum())}",
+        ]
+    if not finite.all():
+        lines.append(f"- undefined/infinite at {int((~finite).sum())} points")
+    index = np.unique(np.linspace(0, len(xs) - 1, min(SAMPLE_COUNT, len(xs))).astype(int))
+    samples = ", ".join(f"{spec.variable}={format_number(xs[i])}: {format_number(ys[i])}" for i in index)
+    lines.append(f"- samples: {samples}")
+    return "\n".join(lines)
+
+
+def calculate(text: str, spec: Optional[RangeSpec] = None) -> str:
+    """Tool entry point: scalar result, or summary statistics over a range"""
+    expression, parsed = parse_query(text) if spec is None else (text, spec)
+    if parsed is None:
+        return f"Result: {text} = {format_number(evaluate(expression))}"
+    xs = parsed.values()
+    ys = evaluate(expression, {parsed.variable: xs})
+    return summarize(expression, parsed, xs, ys)
@@ -0,0 +1,209 @@
+# metrics_history.py - Time-series metrik sistem multi-resolusi (ring array numpy + rollup min/avg/max)
+import math
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from lazy_loader import lazy_import
+
+np = lazy_import("numpy")
+
+FIELDS = ("cpu", "memory", "disk", "net_sent", "net_recv")
+# (resolution seconds, slots): 15 min of 1 s samples, 24 h of 1 min, 30 days of 1 h.
+# attach() coarsens tiers finer than the monitor's sampling interval (same span, fewer slots)
+DEFAULT_TIERS = ((1, 900), (60, 1440), (3600, 720))
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([a-z]*)\s*$")
+_UNIT_SECONDS = {
+    1: ("", "s", "sec", "secs", "second", "seconds"),
+    60: ("m", "min", "mins", "minute", "minutes"),
+    3600: ("h", "hr", "hrs", "hour", "hours"),
+    86400: ("d", "day", "days"),
+    604800: ("w", "wk", "wks", "week", "weeks"),
+}
+_DURATION_UNITS = {unit: seconds for seconds, units in _UNIT_SECONDS.items() for unit in units}
+
+
+def parse_duration(text: Any, default: float = 3600) -> float:
+    """'15m' / '1 hour' / '2d' / 3600 -> seconds"""
+    if text is None or text == "":
+        return float(default)
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = _DURATION.match(str(text).lower())
+    if not match or match.group(2) not in _DURATION_UNITS:
+        raise ValueError(f"Unrecognized duration: {text} (use seconds, minutes, hours, days or weeks)")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+def fit_tiers(tiers: Sequence[Tuple[int, int]], interval: float) -> Tuple[Tuple[int, int], ...]:
+    """Coarsen tiers finer than the sampling interval so no bucket stays empty, keeping each span"""
+    fitted: Dict[int, int] = {}
+    for resolution, slots in sorted(tiers):
+        coarse = max(resolution, math.ceil(interval))
+        fitted[coarse] = max(fitted.get(coarse, 0), -(-resolution * slots // coarse))
+    return tuple(sorted(fitted.items()))
+
+
+class _Tier:
+    """Fixed-size ring of time buckets; each slot keeps min / max / sum / count per field"""
+
+    def __init__(self, resolution: int, slots: int, fields: int):
+        self.resolution = resolution
+        self.slots = slots
+        self.bucket = np.full(slots, -1, dtype=np.int64)
+        self.count = np.zeros(slots, dtype=np.int32)
+        self.min = np.zeros((slots, fields), dtype=np.float64)
+        self.max = np.zeros((slots, fields), dtype=np.float64)
+        self.sum = np.zeros((slots, fields), dtype=np.float64)
+
+    @property
+    def span(self) -> int:
+        return self.resolution * self.slots
+
+    def add(self, timestamp: float, values):
+        bucket = int(timestamp // self.resolution)
+        i = bucket % self.slots
+        if self.bucket[i] != bucket:
+            self.bucket[i] = bucket
+            self.count[i] = 1
+            self.min[i] = values
+            self.max[i] = values
+            self.sum[i] = values
+            return
+        self.count[i] += 1
+        np.minimum(self.min[i], values, out=self.min[i])
+        np.maximum(self.max[i], values, out=self.max[i])
+        self.sum[i] += values
+
+    def select(self, start: float, end: float):
+        """Slot indexes inside [start, end], oldest first"""
+        mask = (self.bucket >= int(start // self.resolution)) & (self.bucket <= int(end // self.resolution))
+        index = np.nonzero(mask)[0]
+        return index[np.argsort(self.bucket[index])]
+
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (self.bucket, self.count, self.min, self.max, self.sum))
+
+
+class MetricsHistory:
+    """Bounded-memory history: every sample lands in each tier, reads pick the finest tier covering the range"""
+
+    def __init__(self, tiers: Sequence[Tuple[int, int]] = DEFAULT_TIERS, fields: Sequence[str] = FIELDS):
+        self.fields = tuple(fields)
+        self._tier_spec = tuple(sorted(tiers))
+        self._tiers: Optional[List[_Tier]] = None
+        self._lock = threading.Lock()
+        self._attached = set()
+
+    def _ensure_tiers(self) -> List[_Tier]:
+        if self._tiers is None:
+            self._tiers = [_Tier(res, slots, len(self.fields)) for res, slots in self._tier_spec]
+        return self._tiers
+
+    def record(self, timestamp: float, values: Sequence[float]):
+        row = np.asarray(values, dtype=np.float64)
+        with self._lock:
+            for tier in self._ensure_tiers():
+                tier.add(timestamp, row)
+
+    def record_sample(self, sample):
+        """SystemMonitor listener"""
+        self.record(sample.timestamp, (sample.cpu_percent, sample.memory_percent, sample.disk_percent,
+                                       sample.net_sent_rate, sample.net_recv_rate))
+
+    def attach(self, monitor):
+        """Subscribe to a system_monitor.SystemMonitor (once per monitor)"""
+        with self._lock:
+            if id(monitor) in self._attached:
+                return
+            self._attached.add(id(monitor))
+            if self._tiers is None:
+                self._tier_spec = fit_tiers(self._tier_spec, monitor.interval)
+        monitor.add_listener(self.record_sample)
+
+    def _tier_for(self, start: float, now: float) -> _Tier:
+        tiers = self._ensure_tiers()
+        for tier in tiers:
+            if now - start <= tier.span:
+                return tier
+        return tiers[-1]
+
+    def query(self, seconds: float = 3600, fields: Optional[Sequence[str]] = None,
+              end: Optional[float] = None, max_points: Optional[int] = None) -> Dict[str, Any]:
+        """min/avg/max series for the last `seconds` (ending at `end`), at most `max_points` points"""
+        if max_points is not None and max_points <= 0:
+            raise ValueError(f"max_points must be positive, got {max_points}")
+        now = time.time()
+        end = now if end is None else end
+        start = end - seconds
+        fields = list(fields or self.fields)
+        columns = [self.fields.index(f) for f in fields]
+        with self._lock:
+            tier = self._tier_for(start, now)
+            index = tier.select(start, end)
+            buckets = tier.bucket[index]
+            count = tier.count[index].astype(np.float64)
+            mins = tier.min[index][:, columns]
+            maxs = tier.max[index][:, columns]
+            sums = tier.sum[index][:, columns]
+
+        resolution = tier.resolution
+        if max_points and len(index) > max_points:
+            # Merge consecutive buckets so the series fits the requested width
+            group = -(-len(index) // max_points)
+            starts = np.arange(0, len(index), group)
+            buckets = buckets[starts]
+            count = np.add.reduceat(count, starts)
+            mins = np.minimum.reduceat(mins, starts, axis=0)
+            maxs = np.maximum.reduceat(maxs, starts, axis=0)
+            sums = np.add.reduceat(sums, starts, axis=0)
+            resolution *= group
+
+        avgs = sums / count[:, None] if len(count) else sums
+        series = {}
+        for j, field in enumerate(fields):
+            series[field] = {
+                "min": mins[:, j].round(2).tolist(),
+                "avg": avgs[:, j].round(2).tolist(),
+                "max": maxs[:, j].round(2).tolist(),
+            }
+        return {
+            "start": start,
+            "end": end,
+            "resolution": resolution,
+            "timestamps": (buckets * tier.resolution).tolist(),
+            "series": series,
+        }
+
+    def summary(self, seconds: float = 3600, fields: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+        """Overall min/avg/max per field over the last `seconds`"""
+        now = time.time()
+        fields = list(fields or self.fields)
+        columns = [self.fields.index(f) for f in fields]
+        with self._lock:
+            tier = self._tier_for(now - seconds, now)
+            index = tier.select(now - seconds, now)
+            if not len(index):
+                return {}
+            total = tier.count[index].sum()
+            mins = tier.min[index][:, columns].min(axis=0)
+            maxs = tier.max[index][:, columns].max(axis=0)
+            avgs = tier.sum[index][:, columns].sum(axis=0) / total
+        return {
+            field: {"min": round(float(mins[j]), 2), "avg": round(float(avgs[j]), 2),
+                    "max": round(float(maxs[j]), 2), "samples": int(total)}
+            for j, field in enumerate(fields)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = self._tiers or []
+            return {
+                "tiers": [(t.resolution, t.slots, int((t.bucket >= 0).sum())) for t in tiers],
+                "bytes": sum(t.nbytes() for t in tiers),
+            }
+
+
+history = MetricsHistory()
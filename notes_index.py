@@ -0,0 +1,325 @@
+# notes_index.py - Full-text search (BM25) untuk notes/, file txt dan HTML hasil tools: inverted index inkremental per mtime
+import heapq
+import html
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+NOTES_INDEX_FILE = os.getenv("NOTES_INDEX_FILE", "notes_index.db")
+# Directories scanned on refresh; files written elsewhere are tracked once added
+NOTES_DIRS = [d.strip() for d in os.getenv("NOTES_DIRS", "notes").split(os.pathsep) if d.strip()]
+NOTE_EXTENSIONS = {".md", ".txt", ".html", ".htm"}
+# Background rescan interval for edits made outside the tools (tools update the index directly on write)
+NOTES_REFRESH_SECONDS = float(os.getenv("NOTES_REFRESH_SECONDS", "30"))
+MAX_FILE_BYTES = 5 * 1024 * 1024
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 160
+# Changed files are written to the index in batches so searches can interleave with a big rescan
+REFRESH_BATCH = 500
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_HTML_DROP = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_HTML_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 or t.isdigit()]
+
+
+def read_text(path: str) -> Tuple[str, str]:
+    """(title, plain text) of a note; HTML is stripped to its visible text"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read(MAX_FILE_BYTES)
+    title = os.path.splitext(os.path.basename(path))[0]
+    if os.path.splitext(path)[1].lower() in (".html", ".htm"):
+        match = _HTML_TITLE.search(text)
+        if match and match.group(1).strip():
+            title = html.unescape(match.group(1).strip())
+        text = html.unescape(_HTML_TAG.sub(" ", _HTML_DROP.sub(" ", text)))
+    else:
+        for line in text.splitlines():
+            if line.startswith("# "):
+                title = line[2:].strip()
+                break
+    return title, text
+
+
+def _pack_terms(counts: Counter) -> bytes:
+    return zlib.compress(" ".join(f"{term}:{tf}" for term, tf in sorted(counts.items())).encode("utf-8"))
+
+
+def _unpack_terms(blob: bytes) -> Iterable[Tuple[str, int]]:
+    for item in zlib.decompress(blob).decode("utf-8").split(" "):
+        if item:
+            term, tf = item.rsplit(":", 1)
+            yield term, int(tf)
+
+
+class NoteDoc(NamedTuple):
+    path: str
+    mtime: float
+    size: int
+    length: int
+    title: str
+
+
+class SearchHit(NamedTuple):
+    path: str
+    title: str
+    score: float
+    snippet: str
+
+
+class NotesIndex:
+    """BM25 over an in-memory inverted index; SQLite keeps one compressed term-frequency row per file"""
+
+    def __init__(self, path: str = NOTES_INDEX_FILE, roots: Optional[List[str]] = None):
+        self.path = path
+        self.roots = NOTES_DIRS if roots is None else roots
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._loaded = False
+        self._docs: Dict[int, NoteDoc] = {}
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._norms: Optional[Dict[int, float]] = None
+        self._last_refresh = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, mtime REAL NOT NULL, size INTEGER NOT NULL, "
+                "length INTEGER NOT NULL, title TEXT NOT NULL, terms BLOB NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def _load(self):
+        """Rebuild postings from the stored term blobs (once per process)"""
+        if self._loaded:
+            return
+        for doc_id, path, mtime, size, length, title, blob in self._conn().execute(
+                "SELECT id, path, mtime, size, length, title, terms FROM docs"):
+            self._attach(doc_id, NoteDoc(path, mtime, size, length, title), _unpack_terms(blob))
+        self._loaded = True
+
+    def _attach(self, doc_id: int, doc: NoteDoc, terms: Iterable[Tuple[str, int]]):
+        self._docs[doc_id] = doc
+        self._ids[doc.path] = doc_id
+        self._total_length += doc.length
+        for term, tf in terms:
+            self._postings.setdefault(term, {})[doc_id] = tf
+        self._norms = None
+
+    def _detach(self, doc_id: int, terms: Iterable[str]):
+        doc = self._docs.pop(doc_id)
+        del self._ids[doc.path]
+        self._total_length -= doc.length
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._norms = None
+
+    def _stored_terms(self, doc_id: int) -> List[str]:
+        row = self._conn().execute("SELECT terms FROM docs WHERE id = ?", (doc_id,)).fetchone()
+        return [term for term, _ in _unpack_terms(row[0])] if row else []
+
+    @staticmethod
+    def _analyze(path: str, stat: os.stat_result) -> Tuple[NoteDoc, Counter]:
+        """Read and tokenize one file; needs no lock"""
+        title, text = read_text(path)
+        counts = Counter(tokenize(title + "\n" + text))
+        return NoteDoc(path, stat.st_mtime, stat.st_size, sum(counts.values()), title), counts
+
+    def _index(self, path: str, stat: os.stat_result) -> bool:
+        """(Re)index one file; caller holds the lock and commits"""
+        doc_id = self._ids.get(path)
+        if doc_id is not None:
+            doc = self._docs[doc_id]
+            if doc.mtime == stat.st_mtime and doc.size == stat.st_size:
+                return False
+        self._store(*self._analyze(path, stat))
+        return True
+
+    def _store(self, doc: NoteDoc, counts: Counter):
+        """Write an analyzed file to SQLite and the postings; caller holds the lock and commits"""
+        path, title = doc.path, doc.title
+        doc_id = self._ids.get(path)
+        db = self._conn()
+        blob = _pack_terms(counts)
+        if doc_id is None:
+            doc_id = db.execute(
+                "INSERT INTO docs (path, mtime, size, length, title, terms) VALUES (?, ?, ?, ?, ?, ?)",
+                (path, doc.mtime, doc.size, doc.length, title, blob)).lastrowid
+        else:
+            self._detach(doc_id, self._stored_terms(doc_id))
+            db.execute("UPDATE docs SET mtime = ?, size = ?, length = ?, title = ?, terms = ? WHERE id = ?",
+                       (doc.mtime, doc.size, doc.length, title, blob, doc_id))
+        self._attach(doc_id, doc, counts.items())
+
+    def _remove(self, path: str):
+        doc_id = self._ids.get(path)
+        if doc_id is not None:
+            self._detach(doc_id, self._stored_terms(doc_id))
+            self._conn().execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+
+    def add_file(self, path: str) -> bool:
+        """Index a file a tool just wrote (no-op when its mtime/size are unchanged)"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._load()
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._remove(path)
+                self._conn().commit()
+                return False
+            changed = self._index(path, stat)
+            self._conn().commit()
+            return changed
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """Pick up new, changed and deleted files under the roots and among tracked files
+
+        Walking, stat() and reading happen without the lock; only the index updates take it.
+        """
+        counts = {"indexed": 0, "removed": 0}
+        with self._lock:
+            self._load()
+            if not force and time.monotonic() - self._last_refresh < NOTES_REFRESH_SECONDS:
+                return counts
+            known = {doc.path: (doc.mtime, doc.size) for doc in self._docs.values()}
+        paths = set(known)
+        for root in self.roots:
+            for directory, _, files in os.walk(os.path.abspath(root)):
+                for name in files:
+                    if os.path.splitext(name)[1].lower() in NOTE_EXTENSIONS:
+                        paths.add(os.path.join(directory, name))
+        removed, changed = [], []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                if path in known:
+                    removed.append(path)
+                continue
+            if known.get(path) != (stat.st_mtime, stat.st_size):
+                changed.append((path, stat))
+        with self._lock:
+            for path in removed:
+                if not os.path.exists(path):  # not re-created by add_file() meanwhile
+                    self._remove(path)
+                    counts["removed"] += 1
+            self._conn().commit()
+        for start in range(0, len(changed), REFRESH_BATCH):
+            analyzed = []
+            for path, stat in changed[start:start + REFRESH_BATCH]:
+                try:
+                    analyzed.append(self._analyze(path, stat))
+                except OSError:
+                    pass
+            with self._lock:
+                for doc, terms in analyzed:
+                    doc_id = self._ids.get(doc.path)
+                    current = self._docs[doc_id] if doc_id is not None else None
+                    # add_file() may have indexed a newer version meanwhile
+                    if ((current.mtime, current.size) if current else None) != known.get(doc.path):
+                        continue
+                    self._store(doc, terms)
+                    counts["indexed"] += 1
+                self._conn().commit()
+        self._last_refresh = time.monotonic()
+        return counts
+
+    def start(self):
+        """Start the background rescan (idempotent); searches never walk the roots themselves"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jarvis-notes", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh(force=True)
+            except Exception as e:
+                print(f"⚠️  Notes rescan failed: {e}")
+            self._stop.wait(NOTES_REFRESH_SECONDS)
+
+    def _doc_norms(self) -> Dict[int, float]:
+        """k1 * (1 - b + b * len / avgdl) per document, recomputed after the collection changes"""
+        if self._norms is None:
+            avgdl = self._total_length / len(self._docs) if self._docs else 1.0
+            self._norms = {doc_id: BM25_K1 * (1 - BM25_B + BM25_B * doc.length / (avgdl or 1.0))
+                           for doc_id, doc in self._docs.items()}
+        return self._norms
+
+    def search(self, query: str, limit: int = 5) -> List[SearchHit]:
+        """Top `limit` documents for `query` ranked by BM25 (the index is kept current by start() and add_file())"""
+        terms = set(tokenize(query))
+        with self._lock:
+            self._load()
+            total = len(self._docs)
+            norms = self._doc_norms()
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norms[doc_id])
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            docs = [(self._docs[doc_id], score) for doc_id, score in best]
+        return [SearchHit(doc.path, doc.title, score, self._snippet(doc.path, terms)) for doc, score in docs]
+
+    @staticmethod
+    def _snippet(path: str, terms) -> str:
+        try:
+            _, text = read_text(path)
+        except OSError:
+            return ""
+        text = " ".join(text.split())
+        lowered = text.lower()
+        positions = [m.start() for m in (re.search(rf"\b{re.escape(t)}\b", lowered) for t in terms) if m]
+        start = max(0, min(positions) - SNIPPET_CHARS // 4) if positions else 0
+        snippet = text[start:start + SNIPPET_CHARS]
+        return ("..." if start else "") + snippet + ("..." if start + SNIPPET_CHARS < len(text) else "")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._load()
+            return {"documents": len(self._docs), "terms": len(self._postings), "tokens": self._total_length}
+
+
+notes_index = NotesIndex()
+
+
+def index_written_file(path: str):
+    """Called by tools right after writing `path`; the write has succeeded even if indexing fails"""
+    try:
+        notes_index.add_file(path)
+    except Exception as e:
+        print(f"⚠️  Notes index update failed for {path}: {e}")
@@ -0,0 +1,163 @@
+# qr_service.py - QR code in-memory (PNG/SVG), bulk render paralel, cache per (data, opsi)
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from cache_utils import TTLCache
+from lazy_loader import lazy_import
+from system_monitor import available_cpus
+
+qrcode = lazy_import("qrcode")
+np = lazy_import("numpy")
+
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", "1024"))
+# Below this many uncached payloads, rendering inline beats shipping work to the pool
+QR_PARALLEL_MIN = int(os.getenv("QR_PARALLEL_MIN", "32"))
+QR_WORKERS = int(os.getenv("QR_WORKERS", "0")) or available_cpus()
+
+PNG = "png"
+SVG = "svg"
+MIME_TYPES = {PNG: "image/png", SVG: "image/svg+xml"}
+ERROR_LEVELS = {"L": 1, "M": 0, "Q": 3, "H": 2}  # qrcode.constants.ERROR_CORRECT_*
+
+
+class QROptions(NamedTuple):
+    format: str = PNG
+    box_size: int = 10
+    border: int = 5
+    error_correction: str = "M"
+    version: Optional[int] = None  # None: smallest version that fits
+
+
+class QRImage(NamedTuple):
+    key: str
+    data: str
+    format: str
+    content: bytes
+
+    @property
+    def mime(self) -> str:
+        return MIME_TYPES[self.format]
+
+    @property
+    def filename(self) -> str:
+        return f"qr_{self.key[:16]}.{self.format}"
+
+
+def qr_key(data: str, options: QROptions) -> str:
+    raw = "\0".join(map(str, (data,) + tuple(options)))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _matrix(data: str, options: QROptions) -> List[List[bool]]:
+    qr = qrcode.QRCode(version=options.version, box_size=options.box_size, border=options.border,
+                       error_correction=ERROR_LEVELS[options.error_correction.upper()])
+    qr.add_data(data)
+    qr.make(fit=options.version is None)
+    return qr.get_matrix()  # includes the border
+
+
+def _png(matrix: List[List[bool]], box_size: int) -> bytes:
+    """1-bit PNG straight from the module matrix (no per-module drawing)"""
+    from PIL import Image
+    modules = np.array(matrix, dtype=bool)
+    pixels = ~np.repeat(np.repeat(modules, box_size, axis=0), box_size, axis=1)  # dark modules = 0
+    height, width = pixels.shape
+    image = Image.frombytes("1", (width, height), np.packbits(pixels, axis=1).tobytes())
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _svg(matrix: List[List[bool]], box_size: int) -> bytes:
+    """One <path> with a rectangle per horizontal run of dark modules"""
+    size = len(matrix)
+    parts = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                parts.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+    pixels = size * box_size
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+            f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+            f'<rect width="100%" height="100%" fill="#fff"/><path d="{"".join(parts)}" fill="#000"/></svg>'
+            ).encode("utf-8")
+
+
+def render(data: str, options: QROptions = QROptions()) -> bytes:
+    """Render one QR code to PNG or SVG bytes (no caching; also runs in pool processes)"""
+    matrix = _matrix(data, options)
+    if options.format == SVG:
+        return _svg(matrix, options.box_size)
+    return _png(matrix, options.box_size)
+
+
+def _render_job(job) -> bytes:
+    data, options = job
+    return render(data, QROptions(*options))
+
+
+class QRService:
+    """Cached QR rendering; big batches fan out over a process pool (qrcode is pure Python)"""
+
+    def __init__(self, cache_size: int = QR_CACHE_SIZE, workers: int = QR_WORKERS):
+        self.workers = workers
+        self._cache = TTLCache(ttl=float("inf"), maxsize=cache_size)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def generate(self, data: str, options: QROptions = QROptions()) -> QRImage:
+        return self.generate_many([data], options)[0]
+
+    def generate_many(self, payloads: Sequence[str], options: QROptions = QROptions()) -> List[QRImage]:
+        """QR images for every payload, in order; cached ones skip rendering"""
+        if options.format not in MIME_TYPES:
+            raise ValueError(f"Unsupported QR format: {options.format}")
+        if options.error_correction.upper() not in ERROR_LEVELS:
+            raise ValueError(f"Unsupported error correction level: {options.error_correction}")
+
+        keys = [qr_key(data, options) for data in payloads]
+        results: Dict[str, bytes] = {}
+        missing: Dict[str, str] = {}
+        for key, data in zip(keys, payloads):
+            content = self._cache.get(key)
+            if content is not None:
+                results[key] = content
+            else:
+                missing.setdefault(key, data)
+
+        if len(missing) >= QR_PARALLEL_MIN and self.workers > 1:
+            chunksize = max(1, len(missing) // (self.workers * 4))
+            jobs = [(data, tuple(options)) for data in missing.values()]
+            rendered = self._get_pool().map(_render_job, jobs, chunksize=chunksize)
+            for key, content in zip(missing, rendered):
+                self._cache.set(key, content)
+                results[key] = content
+        else:
+            for key, data in missing.items():
+                results[key] = self._cache.get_or_load(key, lambda data=data: render(data, options))
+
+        return [QRImage(key, data, options.format, results[key]) for key, data in zip(keys, payloads)]
+
+    def stats(self):
+        return self._cache.stats()
+
+
+qr_service = QRService()
@@ -0,0 +1,132 @@
+# quote_service.py - Harga market batch (satu request bulk untuk banyak simbol) dengan cache TTL pendek
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from cache_utils import TTLCache
+from lazy_loader import lazy_import
+
+yf = lazy_import("yfinance")
+
+QUOTE_TTL = float(os.getenv("QUOTE_CACHE_TTL", "30"))
+# Market cap moves slowly; keep it longer than prices
+MARKET_CAP_TTL = float(os.getenv("MARKET_CAP_CACHE_TTL", "3600"))
+
+
+class Quote(NamedTuple):
+    symbol: str
+    price: Optional[float]
+    volume: Optional[float]
+    market_cap: Optional[float]
+
+
+def normalize_symbols(value) -> List[str]:
+    """'btc-usd, ETH-USD' / ['BTC-USD'] -> ['BTC-USD', 'ETH-USD'] (deduplicated, order kept)"""
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+    symbols = []
+    for item in value or []:
+        symbol = str(item).strip().upper()
+        if symbol and symbol not in symbols:
+            symbols.append(symbol)
+    return symbols
+
+
+class QuoteService:
+    """Bulk quote fetcher; concurrent callers asking for the same symbol share one fetch"""
+
+    def __init__(self, ttl: float = QUOTE_TTL, market_cap_ttl: float = MARKET_CAP_TTL):
+        self._quotes = TTLCache(ttl=ttl, maxsize=1024)
+        self._market_caps = TTLCache(ttl=market_cap_ttl, maxsize=1024)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self.bulk_requests = 0
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Quote]:
+        symbols = normalize_symbols(list(symbols))
+        result: Dict[str, Quote] = {}
+        waiting: Dict[str, Future] = {}
+        to_fetch: Dict[str, Future] = {}
+
+        with self._lock:
+            for symbol in symbols:
+                quote = self._quotes.get(symbol)
+                if quote is not None:
+                    result[symbol] = quote
+                elif symbol in self._in_flight:
+                    waiting[symbol] = self._in_flight[symbol]
+                else:
+                    future = self._in_flight[symbol] = Future()
+                    to_fetch[symbol] = future
+
+        if to_fetch:
+            try:
+                fetched = self._fetch(list(to_fetch))
+                for symbol, future in to_fetch.items():
+                    quote = fetched.get(symbol)
+                    if quote is not None and quote.price is not None:
+                        self._quotes.set(symbol, quote)
+                    future.set_result(quote)
+            except Exception as e:
+                for future in to_fetch.values():
+                    if not future.done():
+                        future.set_exception(e)
+                raise
+            finally:
+                with self._lock:
+                    for symbol in to_fetch:
+                        self._in_flight.pop(symbol, None)
+            result.update({s: q for s, q in fetched.items() if q is not None})
+
+        for symbol, future in waiting.items():
+            quote = future.result()
+            if quote is not None:
+                result[symbol] = quote
+        return result
+
+    def _fetch(self, symbols: List[str]) -> Dict[str, Quote]:
+        """One bulk download for prices/volume; market cap from fast_info (cached)"""
+        self.bulk_requests += 1
+        data = yf.download(
+            symbols, period="1d", group_by="ticker",
+            progress=False, threads=True, auto_adjust=False,
+        )
+        multi = getattr(data.columns, "nlevels", 1) > 1
+        tickers = yf.Tickers(" ".join(symbols)) if symbols else None
+
+        quotes = {}
+        for symbol in symbols:
+            try:
+                frame = data[symbol] if multi else data
+                closes = frame["Close"].dropna()
+                volumes = frame["Volume"].dropna()
+            except KeyError:
+                quotes[symbol] = None
+                continue
+            price = float(closes.iloc[-1]) if len(closes) else None
+            volume = float(volumes.iloc[-1]) if len(volumes) else None
+            quotes[symbol] = Quote(symbol, price, volume, self._market_cap(tickers, symbol))
+        return quotes
+
+    def _market_cap(self, tickers, symbol: str) -> Optional[float]:
+        cached = self._market_caps.get(symbol)
+        if cached is not None:
+            return cached or None
+        try:
+            value = tickers.tickers[symbol].fast_info.market_cap
+        except Exception:
+            value = None
+        # Cache misses as 0 so unknown caps are not re-requested every call
+        self._market_caps.set(symbol, value or 0)
+        return value
+
+    def stats(self):
+        return {
+            "bulk_requests": self.bulk_requests,
+            "quotes": self._quotes.stats(),
+            "market_caps": self._market_caps.stats(),
+        }
+
+
+quote_service = QuoteService()
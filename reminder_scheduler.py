@@ -0,0 +1,251 @@
+# reminder_scheduler.py - Scheduler reminder: min-heap waktu jatuh tempo + store SQLite ter-index
+import heapq
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import ui_bus
+
+REMINDER_DB = os.getenv("REMINDER_DB", "reminders.db")
+LEGACY_FILE = "reminders.json"
+
+PENDING = "pending"
+DONE = "done"
+CANCELLED = "cancelled"
+
+_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400, "week": 604800}
+_EVERY = re.compile(r"every\s+(\d+)?\s*(second|minute|hour|day|week)s?")
+_ALIASES = {"hourly": 3600, "daily": 86400, "weekly": 604800}
+
+
+class Reminder(NamedTuple):
+    id: int
+    message: str
+    due_at: float
+    every: Optional[float]
+
+
+def parse_recurrence(text: Optional[str]) -> Optional[float]:
+    """'every 10 minutes' / 'daily' -> interval in seconds, None if not recurring"""
+    if not text:
+        return None
+    text = text.lower().strip()
+    if text in _ALIASES:
+        return float(_ALIASES[text])
+    match = _EVERY.search(text)
+    if not match:
+        return None
+    return float(int(match.group(1) or 1) * _UNITS[match.group(2)])
+
+
+class ReminderScheduler:
+    """Pending reminders in a min-heap; only pending rows are loaded from SQLite at startup"""
+
+    def __init__(self, path: str = REMINDER_DB, on_fire: Optional[Callable[[Reminder], bool]] = None):
+        self.path = path
+        # Returns False when nobody received the reminder; it then stays pending and is replayed
+        self.on_fire = on_fire or deliver_to_ui
+        self._db: Optional[sqlite3.Connection] = None
+        self._heap: List[tuple] = []
+        self._active: Dict[int, Reminder] = {}
+        # Fired while nobody was connected; replayed on the next UI connect
+        self._undelivered: Dict[int, Reminder] = {}
+        self._replay = False
+        self._listening = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        self.fired = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS reminders ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL, due_at REAL NOT NULL, "
+                "every REAL, status TEXT NOT NULL DEFAULT 'pending', created_at REAL NOT NULL, "
+                "fired_count INTEGER NOT NULL DEFAULT 0)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders (status, due_at)")
+            self._db = db
+        return self._db
+
+    def _load_pending(self):
+        rows = self._conn().execute(
+            "SELECT id, message, due_at, every FROM reminders WHERE status = ? ORDER BY due_at", (PENDING,)
+        ).fetchall()
+        for row in rows:
+            reminder = Reminder(*row)
+            if reminder.id not in self._undelivered:  # already fired, waiting for a UI
+                self._active[reminder.id] = reminder
+        # Rows arrive sorted by due_at, which is already a valid heap
+        self._heap = [(r.due_at, r.id) for r in self._active.values()]
+        heapq.heapify(self._heap)
+
+    def _migrate_legacy(self):
+        """Import reminders.json (one JSON object per line) written by the old set_reminder"""
+        if not os.path.exists(LEGACY_FILE):
+            return
+        now = time.time()
+        with open(LEGACY_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                    due_at = datetime.fromisoformat(item["time"]).timestamp()
+                except (ValueError, KeyError):
+                    continue
+                if due_at > now:
+                    self._insert(item.get("message", "Reminder"), due_at, None)
+        os.replace(LEGACY_FILE, f"{LEGACY_FILE}.migrated")
+
+    def _insert(self, message: str, due_at: float, every: Optional[float]) -> Reminder:
+        db = self._conn()
+        cursor = db.execute(
+            "INSERT INTO reminders (message, due_at, every, created_at) VALUES (?, ?, ?, ?)",
+            (message, due_at, every, time.time()),
+        )
+        db.commit()
+        reminder = Reminder(cursor.lastrowid, message, due_at, every)
+        self._active[reminder.id] = reminder
+        heapq.heappush(self._heap, (due_at, reminder.id))
+        return reminder
+
+    def start(self):
+        """Load pending reminders and start the firing thread (idempotent)"""
+        with self._cond:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopped = False
+            self._migrate_legacy()
+            self._load_pending()
+            self._thread = threading.Thread(target=self._run, name="jarvis-reminders", daemon=True)
+            self._thread.start()
+            if self.on_fire is deliver_to_ui and not self._listening:
+                # Once per scheduler: a stop()/start() cycle must not replay everything twice
+                ui_bus.bus.add_client_listener(self.replay)
+                self._listening = True
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def add(self, message: str, due_at: float, every: Optional[float] = None) -> Reminder:
+        """O(log n) insert; wakes the scheduler only if this is the new earliest reminder"""
+        with self._cond:
+            reminder = self._insert(message, due_at, every)
+            if self._heap[0][1] == reminder.id:
+                self._cond.notify()
+            return reminder
+
+    def replay(self):
+        """Retry reminders that fired while nobody was listening"""
+        with self._cond:
+            self._replay = True
+            self._cond.notify()
+
+    def cancel(self, reminder_id: int) -> bool:
+        with self._cond:
+            active = self._active.pop(reminder_id, None)
+            undelivered = self._undelivered.pop(reminder_id, None)
+            if active is None and undelivered is None:
+                return False
+            db = self._conn()
+            db.execute("UPDATE reminders SET status = ? WHERE id = ?", (CANCELLED, reminder_id))
+            db.commit()
+            # Heap entry is skipped lazily when it reaches the top
+            return True
+
+    def pending(self, limit: int = 20) -> List[Reminder]:
+        with self._cond:
+            waiting = [self._active[i] for _, i in heapq.nsmallest(limit, self._heap) if i in self._active]
+            return (list(self._undelivered.values()) + waiting)[:limit]
+
+    def _pop_due(self, now: float) -> List[Reminder]:
+        due = []
+        db = self._conn()
+        while self._heap and self._heap[0][0] <= now:
+            due_at, reminder_id = heapq.heappop(self._heap)
+            reminder = self._active.get(reminder_id)
+            if reminder is None or reminder.due_at != due_at:
+                continue
+            due.append(reminder)
+            if reminder.every:
+                # Skip missed occurrences (e.g. while the app was closed)
+                next_due = reminder.due_at + reminder.every
+                if next_due <= now:
+                    next_due += ((now - next_due) // reminder.every + 1) * reminder.every
+                updated = reminder._replace(due_at=next_due)
+                self._active[reminder.id] = updated
+                heapq.heappush(self._heap, (next_due, reminder.id))
+                db.execute(
+                    "UPDATE reminders SET due_at = ?, fired_count = fired_count + 1 WHERE id = ?",
+                    (next_due, reminder.id),
+                )
+            else:
+                # Row stays pending until delivery succeeds (see _delivered)
+                del self._active[reminder.id]
+        if due:
+            db.commit()
+        return due
+
+    def _delivered(self, reminder: Reminder):
+        if reminder.every:
+            return  # recurring rows were already advanced in _pop_due
+        db = self._conn()
+        db.execute(
+            "UPDATE reminders SET status = ?, fired_count = fired_count + 1 WHERE id = ? AND status = ?",
+            (DONE, reminder.id, PENDING),
+        )
+        db.commit()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.time()
+                due = self._pop_due(now)
+                if self._replay:
+                    self._replay = False
+                    due = list(self._undelivered.values()) + due
+                    self._undelivered.clear()
+                if not due:
+                    timeout = self._heap[0][0] - now if self._heap else None
+                    self._cond.wait(timeout)
+                    continue
+            for reminder in due:
+                self.fired += 1
+                try:
+                    delivered = self.on_fire(reminder) is not False
+                except Exception as e:
+                    print(f"⚠️  Reminder delivery failed: {e}")
+                    delivered = False
+                with self._cond:
+                    if delivered:
+                        self._delivered(reminder)
+                    elif not reminder.every or reminder.id in self._active:
+                        # A recurring reminder cancelled meanwhile has nothing left to replay
+                        self._undelivered[reminder.id] = reminder
+
+
+def deliver_to_ui(reminder: Reminder) -> bool:
+    """Push a fired reminder to connected UIs as a normal assistant response (False if nobody is connected)"""
+    print(f"⏰ Reminder: {reminder.message}")
+    if not ui_bus.bus.has_clients:
+        return False
+    ui_bus.bus.publish_event({
+        'type': 'response',
+        'text': f"⏰ Reminder: {reminder.message}",
+        'timestamp': datetime.now().isoformat(),
+        'reminder_id': reminder.id,
+    })
+    return True
+
+
+scheduler = ReminderScheduler()
@@ -0,0 +1,280 @@
+# screen_capture.py - Capture layar kontinu: region, fps, diff per tile (numpy), hanya tile yang berubah di-encode
+import base64
+import itertools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import ui_bus
+from lazy_loader import lazy_import
+
+np = lazy_import("numpy")
+cv2 = lazy_import("cv2")
+pyautogui = lazy_import("pyautogui")
+
+CAPTURE_FPS = float(os.getenv("SCREEN_CAPTURE_FPS", "2"))
+TILE_SIZE = int(os.getenv("SCREEN_CAPTURE_TILE", "64"))
+# zlib level 1: several times faster than the default, slightly larger files
+PNG_COMPRESSION = int(os.getenv("SCREEN_CAPTURE_PNG_LEVEL", "1"))
+# Full frame every N seconds so late joiners / dropped deltas recover
+KEYFRAME_SECONDS = float(os.getenv("SCREEN_CAPTURE_KEYFRAME", "10"))
+# Above this fraction of changed tiles one full frame is cheaper than many tiles
+FULL_FRAME_RATIO = 0.5
+
+Region = Tuple[int, int, int, int]
+
+
+def parse_region(value: Any) -> Optional[Region]:
+    """'x,y,w,h' or [x, y, w, h] -> (x, y, w, h)"""
+    if not value:
+        return None
+    parts = value.split(",") if isinstance(value, str) else value
+    region = tuple(int(float(p)) for p in parts)
+    if len(region) != 4 or region[2] <= 0 or region[3] <= 0:
+        raise ValueError("region must be x,y,width,height")
+    return region
+
+
+class ScreenSource:
+    """Real screen: mss when installed (fast, no PIL round trip), pyautogui otherwise
+
+    The mss handle is opened on the first grab(): mss is not thread-safe, so it has to
+    live on the capture thread rather than the thread that built the source.
+    """
+
+    def __init__(self, region: Optional[Region] = None):
+        self.region = region
+        self._mss = None
+        self._opened = False
+
+    def _open(self):
+        self._opened = True
+        try:
+            import mss
+            self._mss = mss.mss()
+        except ImportError:
+            pass
+
+    def grab(self):
+        """RGB uint8 array of shape (height, width, 3)"""
+        if not self._opened:
+            self._open()
+        if self._mss is not None:
+            if self.region:
+                x, y, w, h = self.region
+                monitor = {"left": x, "top": y, "width": w, "height": h}
+            else:
+                monitor = self._mss.monitors[0]
+            # BGRA -> RGB
+            return np.ascontiguousarray(np.asarray(self._mss.grab(monitor))[:, :, 2::-1])
+        return np.asarray(pyautogui.screenshot(region=self.region).convert("RGB"))
+
+    def close(self):
+        if self._mss is not None:
+            self._mss.close()
+            self._mss = None
+        self._opened = False
+
+
+class SyntheticSource:
+    """Deterministic frames (static background + a moving box) for tests and benchmarks"""
+
+    def __init__(self, width: int = 1280, height: int = 720, box: int = 80, step: int = 16):
+        self.width = width
+        self.height = height
+        self.box = box
+        self.step = step
+        self._frame = 0
+        y, x = np.mgrid[0:height, 0:width]
+        self._background = np.stack([(x * 255 // width), (y * 255 // height),
+                                     np.full_like(x, 96)], axis=2).astype(np.uint8)
+
+    def grab(self):
+        frame = self._background.copy()
+        offset = (self._frame * self.step) % (self.width - self.box)
+        frame[40:40 + self.box, offset:offset + self.box] = (255, 64, 0)
+        self._frame += 1
+        return frame
+
+
+class FrameUpdate(NamedTuple):
+    index: int
+    timestamp: float
+    width: int
+    height: int
+    keyframe: bool
+    tiles: List[Tuple[int, int, int, int, bytes]]  # x, y, w, h, PNG bytes
+
+
+def encode_png(pixels) -> bytes:
+    ok, buffer = cv2.imencode(".png", np.ascontiguousarray(pixels[:, :, ::-1]),
+                              [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION])
+    if not ok:
+        raise ValueError("PNG encoding failed")
+    return buffer.tobytes()
+
+
+def changed_tiles(previous, current, tile: int = TILE_SIZE):
+    """Boolean (rows, cols) grid: True where any pixel in the tile differs"""
+    height, width = current.shape[:2]
+    row_bytes = current[0].nbytes
+    tile_bytes = row_bytes // width * tile
+    # Compare 8 bytes at a time when tiles fall on word boundaries
+    word = np.uint64 if row_bytes % 8 == 0 and tile_bytes % 8 == 0 else np.uint8
+    step = tile_bytes // np.dtype(word).itemsize
+    diff = (np.ascontiguousarray(previous).reshape(height, -1).view(word)
+            != np.ascontiguousarray(current).reshape(height, -1).view(word))
+    rows = np.logical_or.reduceat(diff, np.arange(0, height, tile), axis=0)
+    return np.logical_or.reduceat(rows, np.arange(0, rows.shape[1], step), axis=1)
+
+
+class CaptureSession:
+    """Capture at a fixed rate; skip identical frames, encode only the tiles that changed"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, source=None, fps: float = CAPTURE_FPS, tile: int = TILE_SIZE,
+                 output_dir: Optional[str] = None, publish: bool = True,
+                 duration: Optional[float] = None, max_frames: Optional[int] = None):
+        self.id = next(self._ids)
+        self.source = source or ScreenSource()
+        self.interval = 1.0 / max(fps, 0.01)
+        self.tile = tile
+        self.output_dir = output_dir
+        self.publish = publish
+        self.duration = duration
+        self.max_frames = max_frames
+        self._previous = None
+        self._last_keyframe = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._manifest = None
+        self.counters = {"frames": 0, "skipped": 0, "keyframes": 0, "tiles": 0, "bytes": 0,
+                         "capture_ms": 0.0, "encode_ms": 0.0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "CaptureSession":
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self._manifest = open(os.path.join(self.output_dir, "manifest.jsonl"), "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name=f"jarvis-capture-{self.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def step(self) -> Optional[FrameUpdate]:
+        """Capture one frame; returns the update, or None when nothing changed"""
+        start = time.perf_counter()
+        frame = self.source.grab()
+        captured = time.perf_counter()
+        self.counters["capture_ms"] += (captured - start) * 1000
+        now = time.time()
+        height, width = frame.shape[:2]
+
+        tiles = []
+        previous = self._previous
+        keyframe = previous is None or previous.shape != frame.shape or now - self._last_keyframe >= KEYFRAME_SECONDS
+        if not keyframe:
+            grid = changed_tiles(previous, frame, self.tile)
+            if not grid.any():
+                self.counters["skipped"] += 1
+                return None
+            if grid.mean() > FULL_FRAME_RATIO:
+                keyframe = True
+            else:
+                for row, col in zip(*np.nonzero(grid)):
+                    y, x = int(row) * self.tile, int(col) * self.tile
+                    pixels = frame[y:y + self.tile, x:x + self.tile]
+                    tiles.append((x, y, pixels.shape[1], pixels.shape[0], encode_png(pixels)))
+        if keyframe:
+            tiles = [(0, 0, width, height, encode_png(frame))]
+            self._last_keyframe = now
+            self.counters["keyframes"] += 1
+
+        self._previous = frame
+        self.counters["encode_ms"] += (time.perf_counter() - captured) * 1000
+        self.counters["frames"] += 1
+        self.counters["tiles"] += len(tiles)
+        self.counters["bytes"] += sum(len(t[4]) for t in tiles)
+        update = FrameUpdate(self.counters["frames"], now, width, height, keyframe, tiles)
+        self._emit(update)
+        return update
+
+    def _emit(self, update: FrameUpdate):
+        if self.publish:
+            ui_bus.publish('screen_frame', {
+                'session': self.id,
+                'frame': update.index,
+                'width': update.width,
+                'height': update.height,
+                'keyframe': update.keyframe,
+                'tiles': [[x, y, w, h, base64.b64encode(png).decode('ascii')] for x, y, w, h, png in update.tiles],
+            })
+        if self._manifest is not None:
+            names = []
+            for x, y, w, h, png in update.tiles:
+                name = f"frame_{update.index:06d}_{x}_{y}.png"
+                with open(os.path.join(self.output_dir, name), "wb") as f:
+                    f.write(png)
+                names.append([x, y, w, h, name])
+            self._manifest.write(json.dumps({"frame": update.index, "timestamp": update.timestamp,
+                                             "keyframe": update.keyframe, "tiles": names}) + "\n")
+            self._manifest.flush()
+
+    def _run(self):
+        started = time.monotonic()
+        next_at = started
+        try:
+            while not self._stop.is_set():
+                if self.duration is not None and time.monotonic() - started >= self.duration:
+                    break
+                if self.max_frames is not None and self.counters["frames"] >= self.max_frames:
+                    break
+                try:
+                    self.step()
+                except Exception as e:
+                    print(f"⚠️  Screen capture failed: {e}")
+                    break
+                # Fixed cadence; if a frame overran, don't try to catch up
+                next_at = max(next_at + self.interval, time.monotonic())
+                self._stop.wait(next_at - time.monotonic())
+        finally:
+            close = getattr(self.source, "close", None)
+            if close is not None:
+                close()  # on the thread that opened it
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+            sessions.pop(self.id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        frames = self.counters["frames"] + self.counters["skipped"]
+        return dict(self.counters, id=self.id, running=self.running,
+                    capture_ms=round(self.counters["capture_ms"] / max(frames, 1), 2),
+                    encode_ms=round(self.counters["encode_ms"] / max(self.counters["frames"], 1), 2))
+
+
+sessions: Dict[int, CaptureSession] = {}
+
+
+def start_session(**options) -> CaptureSession:
+    session = CaptureSession(**options)
+    sessions[session.id] = session
+    return session.start()
+
+
+def stop_session(session_id: Optional[int] = None) -> List[CaptureSession]:
+    """Stop one session (or all of them when no id is given)"""
+    targets = [sessions[session_id]] if session_id in sessions else ([] if session_id else list(sessions.values()))
+    for session in targets:
+        session.stop()
+    return targets
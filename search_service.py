@@ -0,0 +1,37 @@
+# search_service.py - Web search dengan satu client, cache per query (TTL) dan single-flight
+import os
+import re
+from typing import Any, Dict
+
+from cache_utils import TTLCache
+from lazy_loader import LazyResource
+
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.,;:]+$")
+
+
+def _build_search():
+    from langchain_community.tools import DuckDuckGoSearchRun
+    return DuckDuckGoSearchRun()
+
+
+search_client = LazyResource(_build_search, "duckduckgo")
+search_cache = TTLCache(ttl=SEARCH_CACHE_TTL, maxsize=SEARCH_CACHE_SIZE)
+
+
+def normalize_query(query: str) -> str:
+    """Case, whitespace and trailing punctuation don't change the results"""
+    return _TRAILING_PUNCTUATION.sub("", " ".join(query.lower().split()))
+
+
+def search(query: str) -> str:
+    """Search results for a query; repeats within the TTL and concurrent duplicates share one request"""
+    key = normalize_query(query)
+    return search_cache.get_or_load(key, lambda: search_client.run(query))
+
+
+def stats() -> Dict[str, Any]:
+    """Hit / miss counters for tuning SEARCH_CACHE_TTL"""
+    return dict(search_cache.stats(), ttl=SEARCH_CACHE_TTL)
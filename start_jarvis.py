@@ -87,9 +87,15 @@ if libraries['flask']:
     
     # Flask-based server
     server_code = '''
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory, jsonify, request
 from flask_cors import CORS
 import psutil
+from system_monitor import monitor
+from metrics_history import history, parse_duration
+
+# Retain samples in this process so /api/metrics/history can answer range queries
+history.attach(monitor)
+monitor.start()
 
 app = Flask(__name__)
 CORS(app)
@@ -101,8 +107,8 @@ def index():
 @app.route('/api/status')
 def status():
     try:
-        cpu = psutil.cpu_percent() if psutil else 42
-        memory = psutil.virtual_memory().percent if psutil else 50
+        sample = monitor.latest()
+        cpu, memory = sample.cpu_percent, sample.memory_percent
     except:
         cpu, memory = 42, 50
     
@@ -112,6 +118,16 @@ def status():
         'status': 'online'
     })
 
+@app.route('/api/metrics/history')
+def metrics_history():
+    try:
+        seconds = parse_duration(request.args.get('period'), default=3600)
+        fields = request.args.get('metric')
+        points = request.args.get('points', type=int)
+        return jsonify(history.query(seconds, fields.split(',') if fields else None, max_points=points))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 if __name__ == '__main__':
     import webbrowser
     webbrowser.open('http://localhost:5000')
@@ -0,0 +1,188 @@
+# system_monitor.py - Sampler metrik sistem di background (ring buffer), dibaca tools & UI tanpa blocking
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import ui_bus
+from lazy_loader import lazy_import
+
+psutil = lazy_import("psutil")
+
+SAMPLE_INTERVAL = float(os.getenv("SYSTEM_MONITOR_INTERVAL", "2"))
+HISTORY_SIZE = int(os.getenv("SYSTEM_MONITOR_HISTORY", "300"))
+DISK_PATH = os.getenv("SYSTEM_MONITOR_DISK", os.path.abspath(os.sep))
+# CPU % is the busy share of cpu_times() since the previous sample; one taken sooner than this
+# after the previous one (or the baseline from start()) waits out the rest of the window
+CPU_MIN_WINDOW = 0.1
+
+GB = 1024 ** 3
+
+
+def cpu_busy_percent(before, after) -> float:
+    """Busy share of the CPU time between two psutil.cpu_times() snapshots
+
+    Computed here rather than with cpu_percent(interval=None), whose baseline is kept per
+    calling thread: the first call on every thread returns 0.0.
+    """
+    def split(times):
+        # guest time is already counted in user/nice on Linux
+        total = sum(times) - getattr(times, "guest", 0.0) - getattr(times, "guest_nice", 0.0)
+        return total, total - times.idle - getattr(times, "iowait", 0.0)
+
+    total_before, busy_before = split(before)
+    total_after, busy_after = split(after)
+    elapsed = total_after - total_before
+    if elapsed <= 0:
+        return 0.0
+    return round(min(max((busy_after - busy_before) / elapsed * 100, 0.0), 100.0), 1)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (os.cpu_count() ignores affinity / container limits)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 2
+
+
+class SystemSample(NamedTuple):
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    memory_used: int
+    memory_available: int
+    disk_percent: float
+    disk_free: int
+    net_sent: int
+    net_recv: int
+    net_sent_rate: float
+    net_recv_rate: float
+
+    def to_status(self) -> Dict[str, Any]:
+        """Payload of the 'system_status' UI message"""
+        return {
+            'cpu_percent': self.cpu_percent,
+            'memory_percent': self.memory_percent,
+            'memory_gb': round(self.memory_used / GB, 2),
+            'disk_percent': self.disk_percent,
+            'disk_gb_free': round(self.disk_free / GB, 2),
+            'net_sent_kbps': round(self.net_sent_rate / 1024, 1),
+            'net_recv_kbps': round(self.net_recv_rate / 1024, 1),
+            'timestamp': self.timestamp,
+        }
+
+
+class SystemMonitor:
+    """One psutil sampler per process; readers get the latest snapshot without waiting"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL, history: int = HISTORY_SIZE, publish: bool = True):
+        self.interval = interval
+        self.publish = publish
+        self._samples: deque = deque(maxlen=history)
+        self._listeners: List[Callable[[SystemSample], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_net = None
+        self._last_cpu = None  # (monotonic time, psutil.cpu_times())
+        self._sample_lock = threading.Lock()
+
+    def _prime(self):
+        """CPU and network baselines, so the first sample reports real usage instead of 0"""
+        with self._sample_lock:
+            if self._last_cpu is not None:
+                return
+            self._last_cpu = (time.monotonic(), psutil.cpu_times())
+            net = psutil.net_io_counters()
+            self._last_net = (time.time(), net.bytes_sent, net.bytes_recv)
+
+    def _sample(self) -> SystemSample:
+        self._prime()
+        with self._sample_lock:
+            return self._take_sample()
+
+    def _take_sample(self) -> SystemSample:
+        last_at, last_times = self._last_cpu
+        window = CPU_MIN_WINDOW - (time.monotonic() - last_at)
+        if window > 0:
+            time.sleep(window)
+        times = psutil.cpu_times()
+        cpu = cpu_busy_percent(last_times, times)
+        self._last_cpu = (time.monotonic(), times)
+        now = time.time()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(DISK_PATH)
+        net = psutil.net_io_counters()
+        sent_rate = recv_rate = 0.0
+        if self._last_net is not None:
+            last_time, last_sent, last_recv = self._last_net
+            elapsed = max(now - last_time, 1e-6)
+            sent_rate = max(net.bytes_sent - last_sent, 0) / elapsed
+            recv_rate = max(net.bytes_recv - last_recv, 0) / elapsed
+        self._last_net = (now, net.bytes_sent, net.bytes_recv)
+        return SystemSample(now, cpu, memory.percent, memory.used, memory.available, disk.percent,
+                            disk.free, net.bytes_sent, net.bytes_recv, sent_rate, recv_rate)
+
+    def _record(self, sample: SystemSample):
+        with self._lock:
+            self._samples.append(sample)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(sample)
+            except Exception as e:
+                print(f"⚠️  System monitor listener failed: {e}")
+        if self.publish:
+            ui_bus.publish('system_status', sample.to_status())
+
+    def sample_now(self) -> SystemSample:
+        """Take and record one sample on the calling thread"""
+        sample = self._sample()
+        self._record(sample)
+        return sample
+
+    def start(self):
+        """Start the background sampler (idempotent)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jarvis-sysmon", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        # Baseline right away (psutil is imported here, off the caller's startup path)
+        self._prime()
+        while not self._stop.wait(self.interval):
+            try:
+                self._record(self._sample())
+            except Exception as e:
+                print(f"⚠️  System monitor sample failed: {e}")
+
+    def latest(self) -> SystemSample:
+        """Most recent snapshot; only the very first call before any sample exists does real work"""
+        with self._lock:
+            if self._samples:
+                return self._samples[-1]
+        self.start()
+        return self.sample_now()
+
+    def history(self, seconds: Optional[float] = None) -> List[SystemSample]:
+        with self._lock:
+            samples = list(self._samples)
+        if seconds is None:
+            return samples
+        cutoff = time.time() - seconds
+        return [s for s in samples if s.timestamp >= cutoff]
+
+    def add_listener(self, listener: Callable[[SystemSample], None]):
+        """Call `listener(sample)` from the sampler thread for every new sample"""
+        with self._lock:
+            self._listeners.append(listener)
+
+
+monitor = SystemMonitor()
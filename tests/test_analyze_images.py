@@ -0,0 +1,45 @@
+# test_analyze_images.py - analyzeImages lewat callback yang benar-benar didaftarkan ke ClientTools
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("elevenlabs")
+pytest.importorskip("psutil")
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+
+class RecordingClientTools:
+    """Collects what register_enhanced_tools hands to ClientTools.register"""
+
+    def __init__(self):
+        self.tools = {}
+
+    def register(self, name, handler, is_async=False):
+        self.tools[name] = handler
+
+
+def test_analyze_images_is_registered_and_callable(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    import enhanced_tools
+    from image_batch import ImageIndex
+
+    monkeypatch.setattr(enhanced_tools, "image_index", ImageIndex(str(tmp_path / "index.db"), workers=1))
+    monkeypatch.setattr(enhanced_tools.feed_cache, "start", lambda: None)
+    monkeypatch.setattr(enhanced_tools.notes_index, "start", lambda: None)
+    client_tools = RecordingClientTools()
+    enhanced_tools.register_enhanced_tools(client_tools, warm=False)
+    assert "analyzeImages" in client_tools.tools
+
+    images = tmp_path / "images"
+    images.mkdir()
+    for i in range(2):
+        cv2.imwrite(str(images / f"img_{i}.png"), np.full((48, 64, 3), 40 * (i + 1), dtype=np.uint8))
+
+    result = asyncio.run(client_tools.tools["analyzeImages"]({"directory": str(images)}))
+    assert "Images: 2 (2 analyzed" in result
+    enhanced_tools.image_index.shutdown()
@@ -0,0 +1,56 @@
+# test_email_outbox.py - Outbox lewat SMTP plaintext ke aiosmtpd di loopback (tanpa STARTTLS, tanpa login)
+import os
+import socket
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 OK"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    try:
+        yield controller, handler
+    finally:
+        controller.stop()
+
+
+def test_loopback_plaintext_delivery_reuses_one_connection(smtp_server):
+    from email_outbox import EmailOutbox
+
+    controller, handler = smtp_server
+    # require_tls stays on: loopback hosts are exempt, so no SMTP_STARTTLS=0 is needed
+    outbox = EmailOutbox(host="127.0.0.1", port=controller.port,
+                         username="jarvis@example.com", password="secret", digest_window=0)
+    assert not outbox.require_tls
+    outbox.send("user@example.com", "First", "one")
+    outbox.send("user@example.com", "Second", "two")
+    assert outbox.flush(timeout=10)
+
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [["user@example.com"]] * 2
+    assert b"Subject: Second" in handler.messages[1].content
+    stats = outbox.stats()
+    assert stats["sent"] == 2 and stats["failed"] == 0
+    assert stats["connections"] == 1
@@ -0,0 +1,50 @@
+# test_tool_executor.py - Deadline tool executor: job antrian yang lewat deadline tetap jadi ToolTimeout, dihitung sekali
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tool_executor import ToolExecutor, ToolTimeout
+
+
+def test_queued_job_past_deadline_times_out_once():
+    executor = ToolExecutor(limits={"slow": (1, 1e-9)})
+    try:
+        # The deadline has passed by the time submit() drains the queue: _drain drops the job
+        with pytest.raises(ToolTimeout):
+            executor.call("slow", {}, lambda params: "never")
+        with pytest.raises(ToolTimeout):
+            asyncio.run(executor.call_async("slow", {}, lambda params: "never"))
+        stats = executor.stats()["slow"]
+        assert stats["timed_out"] == 2
+        assert stats["cancelled"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_hung_calls_behind_each_other_all_time_out():
+    executor = ToolExecutor(limits={"hang": (1, 0.3)})
+    release = threading.Event()
+    errors = []
+
+    def call():
+        try:
+            executor.call("hang", {}, lambda params: release.wait(5))
+        except Exception as e:
+            errors.append(type(e).__name__)
+
+    threads = [threading.Thread(target=call) for _ in range(5)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        assert errors == ["ToolTimeout"] * 5
+        assert executor.stats()["hang"]["timed_out"] == 5
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,310 @@
+# tool_executor.py - Non-blocking dispatcher untuk ClientTools callbacks
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Optional
+
+# Per-tool defaults: (max concurrent calls, hard deadline in seconds)
+DEFAULT_LIMITS = {
+    "generateImage": (2, 120.0),
+    "searchWeb": (4, 30.0),
+    "getWeather": (4, 15.0),
+    "weatherInfo": (4, 15.0),
+    "sendEmail": (2, 30.0),
+    "getNews": (2, 20.0),
+    "getCryptoPrice": (2, 20.0),
+    "searchWikipedia": (2, 20.0),
+    "translateText": (4, 20.0),
+    "analyzeImage": (2, 60.0),
+    "analyzeImages": (1, 300.0),
+    "runCommand": (2, 10.0),
+}
+DEFAULT_CONCURRENCY = 4
+DEFAULT_TIMEOUT = 30.0
+
+_local = threading.local()
+
+
+class ToolTimeout(Exception):
+    """Raised when a tool misses its deadline"""
+
+
+def current_cancel_event() -> threading.Event:
+    """Cancel flag for the tool running on this thread (cooperative cancellation)
+
+    Set when the tool misses its deadline. Python threads can't be killed, so a
+    handler that never checks it keeps running as an orphan (see ToolExecutor).
+    """
+    event = getattr(_local, "cancel_event", None)
+    if event is None:
+        event = threading.Event()
+    return event
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the deadline of the tool running on this thread (None when unbounded)"""
+    deadline = getattr(_local, "deadline", None)
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class _Job:
+    __slots__ = ("handler", "parameters", "future", "cancel_event", "deadline", "enqueued",
+                 "orphaned", "finished")
+
+    def __init__(self, handler, parameters, deadline):
+        self.handler = handler
+        self.parameters = parameters
+        self.future = Future()
+        self.cancel_event = threading.Event()
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+        self.orphaned = False
+        self.finished = False
+
+
+class _ToolLane:
+    """Pending queue, running counter and worker threads for one tool"""
+
+    def __init__(self, name: str, max_concurrency: int, timeout: Optional[float]):
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.pool = self._new_pool()
+        self.pending = deque()
+        self.running = 0
+        # Handlers still running past their deadline; they no longer hold a slot
+        self.orphaned = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.max_queue_depth = 0
+
+    def _new_pool(self) -> ThreadPoolExecutor:
+        # Room for every running call plus the orphan allowance, so a started job never
+        # waits inside the pool where queue_depth can't see it
+        return ThreadPoolExecutor(max_workers=2 * self.max_concurrency,
+                                  thread_name_prefix=f"jarvis-tool-{self.name}")
+
+    def resize(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        old, self.pool = self.pool, self._new_pool()
+        old.shutdown(wait=False)  # threads still running finish their job, then exit
+
+
+class ToolExecutor:
+    """Run tool handlers with per-tool limits and deadlines
+
+    Each tool gets its own small thread pool, so a slow tool never holds the
+    threads a quick one needs.
+
+    On a deadline the caller gets ToolTimeout, the job's cancel event is set and
+    its lane slot is released right away, so one hung handler doesn't block the
+    next call. The handler's thread can't be stopped: it is tracked as orphaned
+    until it returns (its result is discarded). Each lane frees at most
+    max_concurrency orphaned slots; beyond that, expired handlers keep their
+    slot so a tool that always hangs can't pile up threads without bound.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, tuple]] = None):
+        self._limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self._lanes: Dict[str, _ToolLane] = {}
+        self._handlers: Dict[str, Callable] = {}
+        self._lock = threading.RLock()
+
+    def configure(self, name: str, max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        """Override concurrency limit / deadline for a tool"""
+        with self._lock:
+            lane = self._lane(name)
+            if max_concurrency is not None and max(1, max_concurrency) != lane.max_concurrency:
+                lane.resize(max_concurrency)
+            if timeout is not None:
+                lane.timeout = timeout
+        self._drain(name)
+
+    def _lane(self, name: str) -> _ToolLane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            concurrency, timeout = self._limits.get(name, (DEFAULT_CONCURRENCY, DEFAULT_TIMEOUT))
+            lane = self._lanes[name] = _ToolLane(name, concurrency, timeout)
+        return lane
+
+    def submit(self, name: str, parameters: Dict[str, Any], handler: Optional[Callable] = None) -> Future:
+        """Queue a tool call and return a Future for its result"""
+        handler = handler or self._handlers[name]
+        with self._lock:
+            lane = self._lane(name)
+            deadline = time.monotonic() + lane.timeout if lane.timeout else None
+            job = _Job(handler, parameters, deadline)
+            lane.pending.append(job)
+            lane.max_queue_depth = max(lane.max_queue_depth, len(lane.pending))
+        job.future.add_done_callback(lambda fut, j=job: self._on_cancel(name, j) if fut.cancelled() else None)
+        self._drain(name)
+        return job.future
+
+    def call(self, name: str, parameters: Dict[str, Any], handler: Optional[Callable] = None) -> Any:
+        """Blocking call honoring the tool deadline"""
+        future = self.submit(name, parameters, handler)
+        timeout = self._lane(name).timeout
+        try:
+            return future.result(timeout=timeout)
+        except (FutureTimeout, CancelledError):
+            # Cancelled = dropped from the queue by _drain after its deadline passed
+            self._expire(name, future)
+            raise ToolTimeout(f"{name} exceeded {timeout:g}s deadline")
+
+    async def call_async(self, name: str, parameters: Dict[str, Any], handler: Optional[Callable] = None) -> Any:
+        """Awaitable call honoring the tool deadline"""
+        future = self.submit(name, parameters, handler)
+        timeout = self._lane(name).timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            self._expire(name, future)
+            raise ToolTimeout(f"{name} exceeded {timeout:g}s deadline")
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # the awaiting task itself was cancelled
+            self._expire(name, future)
+            raise ToolTimeout(f"{name} exceeded {timeout:g}s deadline")
+
+    def _expire(self, name: str, future: Future):
+        """Deadline hit: drop a queued job, or signal a running one and release its slot"""
+        with self._lock:
+            if getattr(future, "_jarvis_expired", False):
+                return  # already counted by _drain
+            self._lane(name).timed_out += 1
+            future._jarvis_expired = True  # counted here, not again as cancelled
+        if future.cancel():
+            return
+        job = getattr(future, "_jarvis_job", None)
+        if job is None:
+            return
+        job.cancel_event.set()
+        with self._lock:
+            lane = self._lane(name)
+            if job.finished or job.orphaned or lane.orphaned >= lane.max_concurrency:
+                return
+            job.orphaned = True
+            lane.running -= 1
+            lane.orphaned += 1
+        self._drain(name)
+
+    def _on_cancel(self, name: str, job: _Job):
+        with self._lock:
+            lane = self._lane(name)
+            try:
+                lane.pending.remove(job)
+            except ValueError:
+                return
+            if not getattr(job.future, "_jarvis_expired", False):
+                lane.cancelled += 1
+
+    def _drain(self, name: str):
+        """Start queued jobs while the tool is under its concurrency limit"""
+        with self._lock:
+            lane = self._lane(name)
+            while lane.pending and lane.running < lane.max_concurrency:
+                job = lane.pending.popleft()
+                if job.deadline is not None and time.monotonic() > job.deadline:
+                    lane.timed_out += 1
+                    job.future._jarvis_expired = True
+                    job.future.cancel()
+                    continue
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                job.future._jarvis_job = job
+                lane.running += 1
+                # Submitted under the lock so configure() can't swap the pool in between
+                lane.pool.submit(self._run, name, job)
+
+    def _run(self, name: str, job: _Job):
+        _local.cancel_event = job.cancel_event
+        _local.deadline = job.deadline
+        ok = False
+        try:
+            result = job.handler(job.parameters)
+            ok = True
+            job.future.set_result(result)
+        except BaseException as e:
+            job.future.set_exception(e)
+        finally:
+            _local.cancel_event = None
+            _local.deadline = None
+            with self._lock:
+                lane = self._lane(name)
+                job.finished = True
+                if job.orphaned:
+                    lane.orphaned -= 1
+                else:
+                    lane.running -= 1
+                if ok:
+                    lane.completed += 1
+                else:
+                    lane.failed += 1
+            self._drain(name)
+
+    def wrap(self, name: str, handler: Callable) -> Callable:
+        """Async handler suitable for ClientTools.register(..., is_async=True)"""
+        self._handlers[name] = handler
+
+        async def dispatch(parameters):
+            try:
+                return await self.call_async(name, parameters, handler)
+            except ToolTimeout as e:
+                return f"Tool timeout: {e}"
+            except Exception as e:
+                return f"Tool error ({name}): {str(e)}"
+
+        dispatch.__name__ = getattr(handler, "__name__", name)
+        dispatch.__doc__ = handler.__doc__
+        return dispatch
+
+    def register(self, client_tools, name: str, handler: Callable,
+                 max_concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        """Drop-in replacement for client_tools.register(name, handler)"""
+        if max_concurrency is not None or timeout is not None:
+            self.configure(name, max_concurrency, timeout)
+        client_tools.register(name, self.wrap(name, handler), is_async=True)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and counters per tool"""
+        with self._lock:
+            return {
+                name: {
+                    "queue_depth": len(lane.pending),
+                    "running": lane.running,
+                    "orphaned": lane.orphaned,
+                    "max_concurrency": lane.max_concurrency,
+                    "timeout": lane.timeout,
+                    "max_queue_depth": lane.max_queue_depth,
+                    "completed": lane.completed,
+                    "failed": lane.failed,
+                    "timed_out": lane.timed_out,
+                    "cancelled": lane.cancelled,
+                }
+                for name, lane in self._lanes.items()
+            }
+
+    def queue_depth(self) -> int:
+        """Total calls waiting for a free slot"""
+        with self._lock:
+            return sum(len(lane.pending) for lane in self._lanes.values())
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            pools = [lane.pool for lane in self._lanes.values()]
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Shared executor used by all tool modules
+executor = ToolExecutor()
+
+
+def register_tool(client_tools, name: str, handler: Callable, **limits):
+    """Register a tool so it runs on the shared executor"""
+    executor.register(client_tools, name, handler, **limits)
@@ -1,16 +1,14 @@
 from elevenlabs.conversational_ai.conversation import ClientTools
-from langchain_community.tools import DuckDuckGoSearchRun
 from dotenv import load_dotenv
-import os
-import openai
-import requests
-from PIL import Image
-from io import BytesIO
+from tool_executor import register_tool
+import search_service
+import image_store
+from notes_index import index_written_file
 
 
 def searchWeb(parameters):
     query = parameters.get("query")
-    results = DuckDuckGoSearchRun(query=query)
+    results = search_service.search(query)
     return results
 
 def save_to_txt(parameters):
@@ -21,6 +19,7 @@ def save_to_txt(parameters):
 
     with open(filename, "a", encoding="utf-8") as file:
         file.write(formatted_data + "\n")
+    index_written_file(filename)
 
 def create_html_file(parameters):
     filename = parameters.get("filename")
@@ -43,39 +42,25 @@ def create_html_file(parameters):
     """
     with open(filename, "w", encoding="utf-8") as file:
         file.write(formatted_html)
+    index_written_file(filename)
 
 def generate_image(parameters):
     prompt = parameters.get("prompt")
+    prompts = parameters.get("prompts") or [prompt]
     filename = parameters.get("filename")
     size = parameters.get("size", "1024x1024")
     save_dir = parameters.get("save_dir", "generated_images")
 
-    os.makedirs(save_dir, exist_ok=True)
-    filepath = os.path.join(save_dir, filename)
-
     load_dotenv()
-    openai.api_key = os.getenv("OPENAI_API_KEY")
-
-    client = openai.OpenAI()
-
-    response = openai.images.generate(
-        prompt=prompt,
-        model="dall-e-3",
-        n=1,
-        size=size,
-        quality="standard"
-    )
-
-    image_url = response.data[0].url
-    print(response)
 
-    image_response = requests.get(image_url)
-    image = Image.open(BytesIO(image_response.content))
-    image.save(filepath)
+    # Several prompts are generated concurrently; repeat prompts come from the image store
+    filenames = image_store.numbered_filenames(filename, len(prompts))
+    images = image_store.generate_many(prompts, filenames, save_dir=save_dir, size=size)
+    return "\n".join(image.path for image in images)
 
 
 client_tools = ClientTools()
-client_tools.register("searchWeb", searchWeb)
-client_tools.register("saveToTxt", save_to_txt)
-client_tools.register("createHtmlFile", create_html_file)
-client_tools.register("generateImage", generate_image)
\ No newline at end of file
+register_tool(client_tools, "searchWeb", searchWeb)
+register_tool(client_tools, "saveToTxt", save_to_txt)
+register_tool(client_tools, "createHtmlFile", create_html_file)
+register_tool(client_tools, "generateImage", generate_image)
\ No newline at end of file
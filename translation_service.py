@@ -0,0 +1,152 @@
+# translation_service.py - Layanan terjemahan bersama: LRU cache, batch request, instance translator dipakai ulang
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from cache_utils import TTLCache
+
+CACHE_SIZE = 4096
+# Google's free endpoint rejects requests above ~5000 characters
+MAX_BATCH_CHARS = 4500
+SEPARATOR = "\n"
+
+
+class Translation(NamedTuple):
+    text: str
+    source: str  # detected language, or "auto" when the backend doesn't report it (deep_translator)
+
+
+class DeepTranslatorBackend:
+    """deep_translator.GoogleTranslator, one instance per (source, target)"""
+
+    name = "deep_translator"
+
+    def __init__(self):
+        from deep_translator import GoogleTranslator
+        self._cls = GoogleTranslator
+        self._instances: Dict[Tuple[str, str], object] = {}
+        self._lock = threading.Lock()
+
+    def _translator(self, source: str, target: str):
+        key = (source, target)
+        with self._lock:
+            translator = self._instances.get(key)
+            if translator is None:
+                translator = self._instances[key] = self._cls(source=source, target=target)
+            return translator
+
+    def translate(self, text: str, source: str, target: str) -> Translation:
+        return Translation(self._translator(source, target).translate(text), source)
+
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[Translation]:
+        return [Translation(t, source) for t in self._translator(source, target).translate_batch(list(texts))]
+
+
+class GoogletransBackend:
+    """googletrans.Translator (single shared instance)"""
+
+    name = "googletrans"
+
+    def __init__(self):
+        from googletrans import Translator
+        self._translator = Translator()
+
+    def translate(self, text: str, source: str, target: str) -> Translation:
+        result = self._translator.translate(text, src=source, dest=target)
+        return Translation(result.text, result.src)
+
+    def translate_batch(self, texts: Sequence[str], source: str, target: str) -> List[Translation]:
+        results = self._translator.translate(list(texts), src=source, dest=target)
+        return [Translation(r.text, r.src) for r in results]
+
+
+def _default_backend():
+    try:
+        return DeepTranslatorBackend()
+    except ImportError:
+        return GoogletransBackend()
+
+
+class TranslationService:
+    """Memoized, batched translation used by every translate tool"""
+
+    def __init__(self, backend=None, cache_size: int = CACHE_SIZE):
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._cache = TTLCache(ttl=float("inf"), maxsize=cache_size)
+        self.requests = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = _default_backend()
+        return self._backend
+
+    def load(self):
+        """Create the backend up front (used by prewarm)"""
+        return self.backend
+
+    def translate(self, text: str, target: str = "en", source: str = "auto") -> Translation:
+        return self.translate_many([text], target, source)[0]
+
+    def translate_many(self, texts: Sequence[str], target: str = "en", source: str = "auto") -> List[Translation]:
+        """Cached results first; remaining unique texts go out as few requests as possible"""
+        results: List[Optional[Translation]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = Translation(text, source)
+                continue
+            cached = self._cache.get((text, source, target))
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.setdefault(text, []).append(i)
+
+        if missing:
+            unique = list(missing)
+            for text, translation in zip(unique, self._request(unique, source, target)):
+                self._cache.set((text, source, target), translation)
+                for i in missing[text]:
+                    results[i] = translation
+        return results
+
+    def _request(self, texts: List[str], source: str, target: str) -> List[Translation]:
+        if len(texts) == 1:
+            self.requests += 1
+            return [self.backend.translate(texts[0], source, target)]
+
+        translations: List[Translation] = []
+        for chunk in self._chunks(texts):
+            translations.extend(self._request_chunk(chunk, source, target))
+        return translations
+
+    def _request_chunk(self, chunk: List[str], source: str, target: str) -> List[Translation]:
+        # Single-line texts travel joined in one request and are split back by line
+        if len(chunk) > 1 and not any(SEPARATOR in text for text in chunk):
+            self.requests += 1
+            joined = self.backend.translate(SEPARATOR.join(chunk), source, target)
+            parts = joined.text.split(SEPARATOR)
+            if len(parts) == len(chunk):
+                return [Translation(part.strip(), joined.source) for part in parts]
+        self.requests += 1
+        return self.backend.translate_batch(chunk, source, target)
+
+    @staticmethod
+    def _chunks(texts: List[str]):
+        chunk, size = [], 0
+        for text in texts:
+            if chunk and size + len(text) + 1 > MAX_BATCH_CHARS:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text) + 1
+        if chunk:
+            yield chunk
+
+    def stats(self):
+        return dict(self._cache.stats(), requests=self.requests)
+
+
+translation_service = TranslationService()
@@ -0,0 +1,138 @@
+# ui_bus.py - In-process event bus dari tools (thread mana saja) ke UI WebSocket
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+Event = Dict[str, Any]
+
+
+class UIEventBus:
+    """Long-lived publisher: tools call publish() from any thread, the UI server drains batches on its loop"""
+
+    def __init__(self, max_pending: int = 1000):
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sink: Optional[Callable[[List[Event]], Awaitable[None]]] = None
+        self._scheduled = False
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.batches = 0
+        self.clients = 0
+        self._client_listeners: List[Callable[[], None]] = []
+
+    @property
+    def connected(self) -> bool:
+        return self._sink is not None
+
+    @property
+    def has_clients(self) -> bool:
+        """A server is attached and at least one browser is connected to it"""
+        return self._sink is not None and self.clients > 0
+
+    def add_client_listener(self, listener: Callable[[], None]):
+        """Call `listener()` whenever a UI client connects (keep it quick: runs on the server loop)"""
+        self._client_listeners.append(listener)
+
+    def client_connected(self):
+        with self._lock:
+            self.clients += 1
+        for listener in list(self._client_listeners):
+            try:
+                listener()
+            except Exception as e:
+                print(f"UI bus client listener error: {e}")
+
+    def client_disconnected(self):
+        with self._lock:
+            self.clients = max(0, self.clients - 1)
+
+    def attach(self, loop: asyncio.AbstractEventLoop, sink: Callable[[List[Event]], Awaitable[None]]):
+        """Route events to `sink(events)` running on `loop` (called by the WebSocket server)"""
+        with self._lock:
+            self._loop = loop
+            self._sink = sink
+
+    def detach(self):
+        with self._lock:
+            self._loop = None
+            self._sink = None
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._scheduled = False
+
+    def publish(self, message_type: str, data: Any = None, **fields):
+        """Queue an event for the UI; drops immediately when no UI server is attached"""
+        if self._sink is None:
+            self.dropped += 1
+            return
+        event = {'type': message_type, 'timestamp': datetime.now().isoformat()}
+        if data is not None:
+            event['data'] = data
+        if fields:
+            event.update(fields)
+        self.publish_event(event)
+
+    def publish_event(self, event: Event):
+        """Queue a pre-built message dict"""
+        with self._lock:
+            loop = self._loop
+            if loop is None:
+                self.dropped += 1
+                return
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(event)
+            self.published += 1
+            if self._scheduled:
+                return
+            self._scheduled = True
+        try:
+            loop.call_soon_threadsafe(self._flush)
+        except RuntimeError:
+            # Loop already closed
+            self.detach()
+
+    def _flush(self):
+        """Runs on the server loop: start draining queued events"""
+        asyncio.ensure_future(self._drain())
+
+    async def _drain(self):
+        """Hand queued events to the sink in order, one batch at a time"""
+        while True:
+            with self._lock:
+                batch = list(self._pending)
+                self._pending.clear()
+                sink = self._sink
+                if not batch or sink is None:
+                    self._scheduled = False
+                    return
+            self.batches += 1
+            self.delivered += len(batch)
+            try:
+                await sink(batch)
+            except Exception as e:
+                print(f"UI bus delivery error: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'connected': self.connected,
+            'clients': self.clients,
+            'pending': len(self._pending),
+            'published': self.published,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'batches': self.batches,
+        }
+
+
+# Shared bus for the whole process
+bus = UIEventBus()
+
+
+def publish(message_type: str, data: Any = None, **fields):
+    """Send an update to the UI (thread-safe, non-blocking)"""
+    bus.publish(message_type, data, **fields)
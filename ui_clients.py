@@ -0,0 +1,189 @@
+# ui_clients.py - Per-client bounded send queues untuk broadcast ke UI
+import asyncio
+import os
+from collections import deque
+from typing import Any, Dict, Optional
+
+import ui_bus
+from ui_codec import ENCODINGS, JSON, EncodedMessage
+
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (DROP_OLDEST, COALESCE, DISCONNECT)
+
+# Message types where only the latest value matters
+COALESCE_TYPES = {"status", "tool_status", "system_status", "audio_level"}
+
+DEFAULT_QUEUE_SIZE = int(os.getenv("UI_CLIENT_QUEUE_SIZE", "256"))
+DEFAULT_POLICY = os.getenv("UI_OVERFLOW_POLICY", COALESCE)
+
+
+def coalesce_key(data: Dict[str, Any]) -> Optional[tuple]:
+    """Messages with the same key replace each other while queued"""
+    msg_type = data.get("type")
+    if msg_type not in COALESCE_TYPES:
+        return None
+    payload = data.get("data")
+    tool = payload.get("tool") if isinstance(payload, dict) else data.get("tool")
+    return (msg_type, tool)
+
+
+class ClientConnection:
+    """One WebSocket client with its own bounded outbound queue and writer task"""
+
+    def __init__(self, hub: "ClientHub", websocket, max_queue: int, policy: str):
+        self.hub = hub
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.encoding = JSON
+        self._queue = deque()
+        self._slots: Dict[tuple, list] = {}
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.writer = asyncio.ensure_future(self._write_loop())
+
+    def enqueue(self, message: EncodedMessage, key: Optional[tuple] = None):
+        """O(1): queue a message for this client without awaiting the socket"""
+        if self._closed:
+            return
+        if self.policy != COALESCE:
+            key = None
+        if key is not None:
+            slot = self._slots.get(key)
+            if slot is not None:
+                slot[0] = message
+                self.coalesced += 1
+                self.hub.coalesced += 1
+                return
+        if len(self._queue) >= self.max_queue:
+            if self.policy == DISCONNECT:
+                self.hub.disconnected += 1
+                self.close()
+                return
+            self._pop_oldest()
+            self.dropped += 1
+            self.hub.dropped += 1
+        slot = [message]
+        if key is not None:
+            self._slots[key] = slot
+        self._queue.append((key, slot))
+        self._wakeup.set()
+
+    def _pop_oldest(self):
+        key, slot = self._queue.popleft()
+        if key is not None and self._slots.get(key) is slot:
+            del self._slots[key]
+        return slot[0]
+
+    async def _write_loop(self):
+        try:
+            while not self._closed:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                message = self._pop_oldest()
+                await self.websocket.send(message.frame(self.encoding))
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            pass
+        finally:
+            self._closed = True
+            self.hub.discard(self.websocket)
+
+    def close(self):
+        """Stop the writer and close the socket (slow consumer or shutdown)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        self._slots.clear()
+        self.writer.cancel()
+        self.hub.discard(self.websocket)
+        asyncio.ensure_future(self._close_socket())
+
+    async def _close_socket(self):
+        try:
+            await self.websocket.close(code=1013, reason="slow consumer")
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+        }
+
+
+class ClientHub:
+    """Set of connected clients; publish() fans out without waiting on any socket"""
+
+    def __init__(self, max_queue: int = DEFAULT_QUEUE_SIZE, policy: str = DEFAULT_POLICY):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.max_queue = max_queue
+        self.policy = policy
+        self.connections: Dict[Any, ClientConnection] = {}
+        self.published = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.disconnected = 0
+
+    def __len__(self):
+        return len(self.connections)
+
+    def __bool__(self):
+        return bool(self.connections)
+
+    def add(self, websocket) -> ClientConnection:
+        """Register a client; must be called from the server event loop"""
+        conn = ClientConnection(self, websocket, self.max_queue, self.policy)
+        self.connections[websocket] = conn
+        # Lets producers (e.g. reminders) know someone is listening again
+        ui_bus.bus.client_connected()
+        return conn
+
+    def discard(self, websocket):
+        conn = self.connections.pop(websocket, None)
+        if conn is not None:
+            ui_bus.bus.client_disconnected()
+        if conn is not None and not conn._closed:
+            conn._closed = True
+            conn.writer.cancel()
+
+    def set_encoding(self, websocket, encoding: str) -> bool:
+        """Switch a client to the encoding it negotiated at connect time"""
+        conn = self.connections.get(websocket)
+        if conn is None or encoding not in ENCODINGS:
+            return False
+        conn.encoding = encoding
+        return True
+
+    def publish(self, data: Dict[str, Any]):
+        """Queue a message for every client; it is serialized once per encoding, not per client"""
+        self.published += 1
+        if not self.connections:
+            return
+        message = EncodedMessage(data)
+        key = coalesce_key(data)
+        for conn in list(self.connections.values()):
+            conn.enqueue(message, key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self.connections),
+            "policy": self.policy,
+            "published": self.published,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "disconnected": self.disconnected,
+        }
@@ -0,0 +1,112 @@
+# ui_codec.py - Encoding pesan UI: JSON (default) atau binary frame yang ringkas
+import base64
+import json
+import struct
+import time
+from datetime import datetime
+from typing import Any, Dict, Union
+
+JSON = "json"
+BINARY = "binary"
+ENCODINGS = (JSON, BINARY)
+
+FRAME_VERSION = 1
+# version (u8) | type code (u8) | timestamp epoch ms (u64) | compact JSON body
+FRAME_HEADER = struct.Struct("!BBQ")
+
+# Keep in sync with TYPE_NAMES in templates/index.html (index = code, 0 = type carried in body)
+TYPE_CODES = {
+    "connection": 1,
+    "status": 2,
+    "error": 3,
+    "transcript": 4,
+    "response": 5,
+    "correction": 6,
+    "tool_activation": 7,
+    "tool_status": 8,
+    "tool_result": 9,
+    "tool_error": 10,
+    "system_status": 11,
+    "audio_level": 12,
+    "screen_frame": 13,
+    "artifact": 14,
+    "command_output": 15,
+}
+ARTIFACT = "artifact"
+# Artifact frames: header | u32 JSON length | JSON body | raw `payload` bytes
+PAYLOAD_LENGTH = struct.Struct("!I")
+
+_compact = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str).encode
+
+
+def encode_json(data: Dict[str, Any]) -> str:
+    payload = data.get("payload")
+    if isinstance(payload, bytes):
+        # JSON clients get binary payloads base64-encoded
+        data = dict(data, payload=base64.b64encode(payload).decode("ascii"), payload_encoding="base64")
+    return _compact(data)
+
+
+def _epoch_ms(timestamp) -> int:
+    if isinstance(timestamp, (int, float)):
+        return int(timestamp)
+    if isinstance(timestamp, str):
+        try:
+            return int(datetime.fromisoformat(timestamp).timestamp() * 1000)
+        except ValueError:
+            pass
+    return int(time.time() * 1000)
+
+
+def encode_binary(data: Dict[str, Any]) -> bytes:
+    """Typed frame: integer type code and epoch-ms timestamp in a fixed header"""
+    body = dict(data)
+    code = TYPE_CODES.get(body.get("type"), 0)
+    if code:
+        del body["type"]
+    timestamp = _epoch_ms(body.pop("timestamp", None))
+    header = FRAME_HEADER.pack(FRAME_VERSION, code, timestamp)
+    if code == TYPE_CODES[ARTIFACT]:
+        payload = body.pop("payload", b"")
+        meta = _compact(body).encode("utf-8")
+        return header + PAYLOAD_LENGTH.pack(len(meta)) + meta + payload
+    return header + _compact(body).encode("utf-8")
+
+
+def decode_binary(frame: bytes) -> Dict[str, Any]:
+    version, code, timestamp = FRAME_HEADER.unpack_from(frame)
+    if version != FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version {version}")
+    if code == TYPE_CODES[ARTIFACT]:
+        offset = FRAME_HEADER.size + PAYLOAD_LENGTH.size
+        (length,) = PAYLOAD_LENGTH.unpack_from(frame, FRAME_HEADER.size)
+        data = json.loads(frame[offset:offset + length].decode("utf-8"))
+        data["payload"] = bytes(frame[offset + length:])
+    else:
+        data = json.loads(frame[FRAME_HEADER.size:].decode("utf-8"))
+    if code:
+        data["type"] = next(name for name, value in TYPE_CODES.items() if value == code)
+    data["timestamp"] = timestamp
+    return data
+
+
+def encode(data: Dict[str, Any], encoding: str = JSON) -> Union[str, bytes]:
+    if encoding == BINARY:
+        return encode_binary(data)
+    return encode_json(data)
+
+
+class EncodedMessage:
+    """A published message; each encoding is produced once and shared by all clients"""
+
+    __slots__ = ("data", "_frames")
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self._frames = {}
+
+    def frame(self, encoding: str = JSON) -> Union[str, bytes]:
+        frame = self._frames.get(encoding)
+        if frame is None:
+            frame = self._frames[encoding] = encode(self.data, encoding)
+        return frame
@@ -0,0 +1,76 @@
+# weather_service.py - Geocode + cuaca dengan cache dua level (geocode persisten, cuaca per grid TTL)
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import http_client
+from cache_utils import JsonStore, RateLimiter, SingleFlight, TTLCache
+from lazy_loader import LazyResource, lazy_import
+
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+# Cache tuning (seconds / degrees); 0.1° grid cell is roughly 11 km
+WEATHER_TTL = float(os.getenv("WEATHER_CACHE_TTL", "600"))
+WEATHER_STALE_TTL = float(os.getenv("WEATHER_STALE_TTL", "3600"))
+WEATHER_GRID = float(os.getenv("WEATHER_GRID_DEGREES", "0.1"))
+GEOCODE_CACHE_FILE = os.getenv("GEOCODE_CACHE_FILE", "geocode_cache.json")
+# "Not found" answers are retried after this long (a transient geocoder failure shouldn't stick)
+GEOCODE_NEGATIVE_TTL = float(os.getenv("GEOCODE_NEGATIVE_TTL", "900"))
+
+geolocator = LazyResource(lambda: lazy_import("geopy.geocoders").Nominatim(user_agent="jarvis-ai"), "geolocator")
+# Nominatim usage policy: max 1 request per second
+nominatim_limiter = RateLimiter(1.0)
+geocode_store = LazyResource(lambda: JsonStore(GEOCODE_CACHE_FILE), "geocode_store")
+_geocode_flight = SingleFlight()
+weather_cache = TTLCache(ttl=WEATHER_TTL, maxsize=512, stale_ttl=WEATHER_STALE_TTL)
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.lower().split())
+
+
+def geocode(location: str) -> Optional[Tuple[float, float]]:
+    """Location name -> (lat, lon), cached on disk; None if not found"""
+    key = normalize_location(location)
+    cached = geocode_store.get(key, None)
+    if isinstance(cached, list):
+        return tuple(cached)
+    # Negative entries are {"missing_at": epoch}; older files stored null, which is simply retried
+    if isinstance(cached, dict) and time.time() - cached.get("missing_at", 0) < GEOCODE_NEGATIVE_TTL:
+        return None
+
+    def lookup():
+        nominatim_limiter.wait()
+        loc = geolocator.geocode(location)
+        coords = [loc.latitude, loc.longitude] if loc else None
+        geocode_store.set(key, coords if coords else {"missing_at": time.time()})
+        return coords
+
+    coords = _geocode_flight.do(key, lookup)
+    return tuple(coords) if coords else None
+
+
+def grid_cell(lat: float, lon: float, grid: float = WEATHER_GRID) -> Tuple[float, float]:
+    """Snap coordinates to the cache grid so nearby lookups share an entry"""
+    return (round(round(lat / grid) * grid, 4), round(round(lon / grid) * grid, 4))
+
+
+def fetch_weather(lat: float, lon: float, api_key: str) -> Dict[str, Any]:
+    response = http_client.get(
+        WEATHER_URL,
+        params={"lat": lat, "lon": lon, "appid": api_key, "units": "metric"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_current_weather(location: str, api_key: str) -> Optional[Dict[str, Any]]:
+    """OpenWeatherMap response for a location, served from cache when possible"""
+    coords = geocode(location)
+    if coords is None:
+        return None
+    cell = grid_cell(*coords)
+    return weather_cache.get_or_load(cell, lambda: fetch_weather(cell[0], cell[1], api_key))
+
+
+def stats() -> Dict[str, Any]:
+    return {"weather": weather_cache.stats()}
@@ -0,0 +1,115 @@
+# wiki_cache.py - Cache ringkasan Wikipedia di SQLite + index in-memory, dengan request coalescing
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from cache_utils import SingleFlight
+from lazy_loader import lazy_import
+
+wikipedia = lazy_import("wikipedia")
+
+WIKI_CACHE_FILE = os.getenv("WIKI_CACHE_FILE", "wiki_cache.db")
+WIKI_CACHE_TTL = float(os.getenv("WIKI_CACHE_TTL", str(30 * 24 * 3600)))
+# Failed lookups are retried sooner
+WIKI_MISSING_TTL = float(os.getenv("WIKI_MISSING_TTL", str(24 * 3600)))
+
+SUMMARY = "summary"
+DISAMBIGUATION = "disambiguation"
+MISSING = "missing"
+
+Result = Tuple[str, Union[str, List[str]]]
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class WikiSummaryStore:
+    """Persistent (SQLite) summary store with an in-memory front"""
+
+    def __init__(self, path: str = WIKI_CACHE_FILE, sentences: int = 3):
+        self.path = path
+        self.sentences = sentences
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._memory: Dict[str, Tuple[str, Any, float]] = {}
+        self._flight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "query TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self._db = db
+        return self._db
+
+    def _expired(self, kind: str, fetched_at: float) -> bool:
+        ttl = WIKI_MISSING_TTL if kind == MISSING else WIKI_CACHE_TTL
+        return time.time() - fetched_at > ttl
+
+    def _read(self, key: str) -> Optional[Tuple[str, Any, float]]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                row = self._conn().execute(
+                    "SELECT kind, payload, fetched_at FROM summaries WHERE query = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                entry = (row[0], json.loads(row[1]), row[2])
+                self._memory[key] = entry
+        return None if self._expired(entry[0], entry[2]) else entry
+
+    def _write(self, key: str, kind: str, payload: Any):
+        fetched_at = time.time()
+        with self._lock:
+            self._memory[key] = (kind, payload, fetched_at)
+            db = self._conn()
+            db.execute(
+                "INSERT OR REPLACE INTO summaries (query, kind, payload, fetched_at) VALUES (?, ?, ?, ?)",
+                (key, kind, json.dumps(payload, ensure_ascii=False), fetched_at),
+            )
+            db.commit()
+
+    def _fetch(self, query: str) -> Result:
+        try:
+            return SUMMARY, wikipedia.summary(query, sentences=self.sentences)
+        except wikipedia.exceptions.DisambiguationError as e:
+            return DISAMBIGUATION, list(e.options[:20])
+        except wikipedia.exceptions.PageError:
+            return MISSING, ""
+
+    def lookup(self, query: str) -> Result:
+        """(kind, payload): summary text, disambiguation options or missing"""
+        key = normalize_query(query)
+        entry = self._read(key)
+        if entry is not None:
+            self.hits += 1
+            return entry[0], entry[1]
+        self.misses += 1
+
+        def load():
+            kind, payload = self._fetch(query)
+            self._write(key, kind, payload)
+            return kind, payload
+
+        return self._flight.do(key, load)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_fetches": self._flight.shared,
+        }
+
+
+wiki_store = WikiSummaryStore()